@@ -1,10 +1,21 @@
-import streamlit as st
-import requests
-import json
+import startup_profile
+import os
 import base64
-import boto3
+import streamlit as st
 import pandas as pd
+import http_client
+from http_client import GITHUB_API, github_headers
+from datetime import date
 import time
+from llm import stream_claude, create_client
+from response_cache import ResponseCache
+from github_cache import GitHubReadCache
+from history_store import HistoryStore, HISTORY_FILE
+import job_tracker
+from issue_ops import IssueOps
+from topic_pool import TopicPool, POOL_FILE, parse_topics
+import metrics
+from metrics import METRICS_FILE
 
 st.set_page_config(page_title="LinkedIn Command Center", page_icon="🚀", layout="wide")
 
@@ -17,13 +28,75 @@ AWS_SECRET_ACCESS_KEY = st.secrets["AWS_SECRET_ACCESS_KEY"]
 HASHNODE_TOKEN = st.secrets["HASHNODE_TOKEN"]
 HASHNODE_PUBLICATION_ID = st.secrets["HASHNODE_PUBLICATION_ID"]
 
-HEADERS = {
-    "Authorization": f"token {GITHUB_PAT}",
-    "Accept": "application/vnd.github.v3+json"
-}
+HEADERS = github_headers(GITHUB_PAT)
+
+REPO_URL = f"{GITHUB_API}/repos/{REPO_OWNER}/{REPO_NAME}"
+ISSUES_URL = f"{REPO_URL}/issues"
+DRAFTS_KEY = f"{ISSUES_URL}?labels=draft&state=open"
+HISTORY_URL = f"{REPO_URL}/contents/{HISTORY_FILE}"
+METRICS_URL = f"{REPO_URL}/contents/{METRICS_FILE}"
+POOL_URL = f"{REPO_URL}/contents/{POOL_FILE}"
+ARCHIVE_PAGE_SIZE = 25
+DRAFTS_PAGE_SIZE = 10
+HASHNODE_API = os.environ.get("HASHNODE_API_URL", "https://gql.hashnode.com/")
+
+@st.cache_resource
+def get_response_cache():
+    return ResponseCache()
+
+@st.cache_resource
+def get_bedrock():
+    return create_client(AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY)
+
+@st.cache_resource
+def get_github_cache():
+    return GitHubReadCache(HEADERS)
+
+@st.cache_resource
+def get_history_store():
+    # In-memory mirror of the repo's history file; each fetch only parses lines it hasn't seen.
+    return HistoryStore(path=None)
+
+def parse_history(resp):
+    store = get_history_store()
+    store.feed(resp.content)
+    return store
+
+@st.cache_resource
+def get_issue_ops():
+    return IssueOps(REPO_OWNER, REPO_NAME, HEADERS)
+
+@st.cache_resource
+def get_section_cache():
+    return {}
+
+def split_draft(raw_body):
+    try:
+        hn_text = raw_body.split("---HASHNODE_ARTICLE---")[1].split("---LINKEDIN_POST---")[0].strip()
+        li_text = raw_body.split("---LINKEDIN_POST---")[1].split("---END---")[0].strip()
+    except IndexError:
+        hn_text = raw_body
+        li_text = ""
+    return hn_text, li_text
+
+def load_draft_sections(issue):
+    # Bodies are fetched and split only for opened drafts, and only again once updated_at moves.
+    sections = get_section_cache()
+    key = (issue['number'], issue['updated_at'])
+    if key not in sections:
+        status, full = gh_cache.get(f"{ISSUES_URL}/{issue['number']}", max_age=0)
+        if status != 200:
+            return None
+        for old in [k for k in sections if k[0] == issue['number']]:
+            del sections[old]
+        sections[key] = split_draft(full['body'] or "")
+    return sections[key]
+
+def report_caption(report):
+    return f"⚡ {report['action']}: {report['round_trips']} round trip(s), {report['seconds']:.2f}s end to end"
 
-ISSUES_URL = f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/issues?labels=draft&state=open"
-HISTORY_URL = f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/contents/topic_history.json"
+gh_cache = get_github_cache()
+issue_ops = get_issue_ops()
 
 def publish_blog_to_hashnode(content):
     headers = {"Authorization": HASHNODE_TOKEN, "Content-Type": "application/json"}
@@ -39,60 +112,114 @@ def publish_blog_to_hashnode(content):
     variables = {
         "input": {"title": title, "contentMarkdown": body_content, "publicationId": HASHNODE_PUBLICATION_ID}
     }
-    resp = requests.post("https://gql.hashnode.com/", headers=headers, json={"query": query, "variables": variables})
+    resp = http_client.post(HASHNODE_API, headers=headers, json={"query": query, "variables": variables})
     if resp.status_code != 200:
         raise Exception(f"Hashnode API Error: {resp.text}")
     return resp.json()['data']['publishPost']['post']['url']
 
+def queue_topics(topics, attempts=3):
+    # Read-modify-write against the file's blob sha; if the drafter committed in between, GitHub says 409 and we redo it.
+    for _ in range(attempts):
+        resp = http_client.get(POOL_URL, headers=HEADERS)
+        if resp.status_code == 200:
+            data, sha = base64.b64decode(resp.json()["content"]), resp.json()["sha"]
+        elif resp.status_code == 404:
+            data, sha = b"", None
+        else:
+            raise Exception(f"GitHub Error: {resp.text}")
+
+        pool = TopicPool(path=None, data=data)
+        added = [t for t in topics if pool.push(t, "brainstorm")]
+        if not added:
+            return added, len(pool)
+        body = {
+            "message": f"Queue {len(added)} brainstormed topic(s) [skip ci]",
+            "content": base64.b64encode(data + "".join(pool.pending).encode()).decode()
+        }
+        if sha:
+            body["sha"] = sha
+        put = http_client.put(POOL_URL, headers=HEADERS, json=body)
+        if put.status_code in (200, 201):
+            return added, len(pool)
+        if put.status_code not in (409, 422):
+            raise Exception(f"GitHub Error: {put.text}")
+    raise Exception(f"{POOL_FILE} kept changing underneath us, try again")
+
 st.title("🚀 LinkedIn Agent Command Center")
-tab1, tab2, tab3 = st.tabs(["✍️ Generate Post", "📊 Dashboard", "🧠 Brainstormer"])
+tab1, tab2, tab3, tab4 = st.tabs(["✍️ Generate Post", "📊 Dashboard", "🧠 Brainstormer", "📈 Metrics"])
 
 # TAB 1: GENERATION CONTROLS
 with tab1:
     st.markdown("### Force the Agent to write a specific post")
     topic_input = st.text_input("Custom Topic:", placeholder="e.g., Sliding Window Pattern in Python")
 
+    if "draft_jobs" not in st.session_state:
+        st.session_state.draft_jobs = []
+
     if st.button("🚀 Generate Draft Now", type="primary"):
-        current_issues_resp = requests.get(ISSUES_URL, headers=HEADERS)
-        current_issue_ids = [issue['id'] for issue in current_issues_resp.json()] if current_issues_resp.status_code == 200 else []
-        
-        with st.spinner("Waking up GitHub Actions & generating draft (takes ~60-90 seconds)..."):
-            url = f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/actions/workflows/daily_draft.yml/dispatches"
-            payload = {"ref": "main", "inputs": {"custom_topic": topic_input}}
-            requests.post(url, headers=HEADERS, json=payload)
-            
-            for _ in range(24):
-                time.sleep(5)
-                check_resp = requests.get(ISSUES_URL, headers=HEADERS)
-                if check_resp.status_code == 200:
-                    if any(i['id'] not in current_issue_ids for i in check_resp.json()):
-                        st.success("✅ Draft generated! Refreshing...")
-                        time.sleep(2)
-                        st.rerun()
-            st.warning("⏳ Check the Dashboard tab in a minute.")
+        job = job_tracker.dispatch(REPO_URL, HEADERS, job_tracker.new_job(topic_input.strip()))
+        st.session_state.draft_jobs.insert(0, job)
+
+    any_active = any(job_tracker.is_active(j) for j in st.session_state.draft_jobs)
+
+    # Polls on its own timer so the rest of the page stays interactive while runs are in flight.
+    @st.fragment(run_every=3 if any_active else None)
+    def render_draft_jobs():
+        finished = False
+        for job in st.session_state.draft_jobs:
+            was_active = job_tracker.is_active(job)
+            job_tracker.poll(REPO_URL, gh_cache, job)
+            finished = finished or (was_active and not job_tracker.is_active(job))
+
+            label = job['topic'] or "Agent's choice"
+            elapsed = int(job_tracker.elapsed(job))
+            if job['status'] == "completed":
+                link = f" · [Open draft]({job['issue_url']})" if job['issue_url'] else ""
+                st.success(f"✅ {label} — done in {elapsed}s{link}")
+            elif job['status'] == "failed":
+                link = f" · [Run logs]({job['run_url']})" if job['run_url'] else ""
+                st.error(f"❌ {label} — {job['conclusion']}{link}")
+            else:
+                link = f" · [Run]({job['run_url']})" if job['run_url'] else ""
+                st.info(f"⏳ {label} — {job['status'].replace('_', ' ')} ({elapsed}s){link}")
+
+        if finished:
+            gh_cache.invalidate(ISSUES_URL)
+            st.rerun()
+
+    render_draft_jobs()
 
 # TAB 2: THE DASHBOARD (NOW WITH INNER TABS)
 with tab2:
     st.markdown("### 📋 Awaiting Your Approval")
-    issues_resp = requests.get(ISSUES_URL, headers=HEADERS)
-    
-    if issues_resp.status_code == 200:
-        issues = issues_resp.json()
+    try:
+        issues = gh_cache.memo(DRAFTS_KEY, lambda: issue_ops.list_issues(["draft"]))
+    except Exception as e:
+        issues = None
+        st.error(f"Could not fetch drafts from GitHub: {e}")
+
+    if issues is not None:
         if not issues:
             st.info("🎉 No drafts waiting for approval! You're all caught up.")
-            
-        for issue in issues:
+
+        pages = max(1, -(-len(issues) // DRAFTS_PAGE_SIZE))
+        if pages > 1:
+            page = st.number_input(f"{len(issues)} drafts · Page (of {pages}):", min_value=1, max_value=pages, value=1, key="drafts_page")
+        else:
+            page = 1
+
+        for issue in issues[(page - 1) * DRAFTS_PAGE_SIZE:page * DRAFTS_PAGE_SIZE]:
             issue_num = issue['number']
-            raw_body = issue['body'] or ""
-            
-            try:
-                hn_text = raw_body.split("---HASHNODE_ARTICLE---")[1].split("---LINKEDIN_POST---")[0].strip()
-                li_text = raw_body.split("---LINKEDIN_POST---")[1].split("---END---")[0].strip()
-            except IndexError:
-                hn_text = raw_body
-                li_text = ""
+            if not st.toggle(f"📝 {issue['title']}", key=f"open_{issue_num}", help=f"Last updated {issue['updated_at']}"):
+                continue
+
+            sections = load_draft_sections(issue)
+            if sections is None:
+                st.error(f"Could not load #{issue_num} from GitHub.")
+                continue
+            hn_text, li_text = sections
 
-            with st.expander(f"📝 Draft: {issue['title']}", expanded=True):
+            with st.container(border=True):
                 
                 # --- INNER TABS FOR REVIEW ---
                 blog_tab, li_tab = st.tabs(["📝 Review Hashnode Blog", "💼 Review LinkedIn Post"])
@@ -111,19 +238,29 @@ with tab2:
                 
                 with col1:
                     if st.button("💾 Save Edits", key=f"save_{issue_num}"):
-                        requests.patch(f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/issues/{issue_num}", headers=HEADERS, json={"body": new_full_body})
-                        st.success("✅ Saved!")
+                        try:
+                            with issue_ops.action("Save edits") as report:
+                                st.session_state["last_report"] = report  # per session; the dict is filled in when the block exits
+                                issue_ops.transition(issue['node_id'], body=new_full_body)
+                            gh_cache.invalidate(ISSUES_URL)
+                            st.success("✅ Saved!")
+                            st.caption(report_caption(report))
+                        except Exception as e:
+                            st.error(f"Failed: {e}")
                 
                 with col2:
                     if st.button("1️⃣ Publish Blog", type="primary", key=f"pub_blog_{issue_num}"):
                         with st.spinner("Publishing to Hashnode..."):
                             try:
-                                url = publish_blog_to_hashnode(updated_hn)
+                                with issue_ops.action("Publish blog") as report:
+                                    st.session_state["last_report"] = report
+                                    url = publish_blog_to_hashnode(updated_hn)
 
-                                appended_li = updated_li + f"\n\n📖 Read the detailed guide/blog on this here: {url}"
-                                appended_body = f"🤖 Draft generated for topic: {issue['title'].replace('Draft: ', '')}\n\n---HASHNODE_ARTICLE---\n{updated_hn}\n---LINKEDIN_POST---\n{appended_li}\n---END---\n"
-                                
-                                requests.patch(f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/issues/{issue_num}", headers=HEADERS, json={"body": appended_body})
+                                    appended_li = updated_li + f"\n\n📖 Read the detailed guide/blog on this here: {url}"
+                                    appended_body = f"🤖 Draft generated for topic: {issue['title'].replace('Draft: ', '')}\n\n---HASHNODE_ARTICLE---\n{updated_hn}\n---LINKEDIN_POST---\n{appended_li}\n---END---\n"
+
+                                    issue_ops.transition(issue['node_id'], body=appended_body)
+                                gh_cache.invalidate(ISSUES_URL)
                                 st.success("✅ Blog Live! Reloading UI...")
                                 time.sleep(2)
                                 st.rerun()
@@ -132,45 +269,55 @@ with tab2:
                                 
                 with col3:
                     if st.button("2️⃣ Publish to LinkedIn", type="primary", key=f"pub_li_{issue_num}"):
-                        requests.patch(f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/issues/{issue_num}", headers=HEADERS, json={"body": new_full_body})
-                        requests.post(f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/issues/{issue_num}/labels", headers=HEADERS, json={"labels": ["publish"]})
-                        st.success("🚀 Pushing to LinkedIn! (Check GitHub Actions)")
-                        time.sleep(2)
-                        st.rerun()
+                        try:
+                            with issue_ops.action("Publish to LinkedIn") as report:
+                                st.session_state["last_report"] = report
+                                issue_ops.transition(issue['node_id'], body=new_full_body, add_labels=["publish"])
+                            gh_cache.invalidate(ISSUES_URL)
+                            st.success("🚀 Pushing to LinkedIn! (Check GitHub Actions)")
+                            time.sleep(2)
+                            st.rerun()
+                        except Exception as e:
+                            st.error(f"Failed: {e}")
                         
                 with col4:
                     if st.button("🗑️ Discard", key=f"discard_{issue_num}"):
-                        requests.patch(f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/issues/{issue_num}", headers=HEADERS, json={"state": "closed"})
-                        st.success("🗑️ Discarded!")
-                        time.sleep(1)
-                        st.rerun()
+                        try:
+                            with issue_ops.action("Discard") as report:
+                                st.session_state["last_report"] = report
+                                issue_ops.transition(issue['node_id'], close=True)
+                            gh_cache.invalidate(ISSUES_URL)
+                            st.success("🗑️ Discarded!")
+                            time.sleep(1)
+                            st.rerun()
+                        except Exception as e:
+                            st.error(f"Failed: {e}")
 
-    else:
-        st.error("Could not fetch drafts from GitHub.")
     
     st.markdown("---")
     st.markdown("### 📚 Content Archive")
     
-    hist_resp = requests.get(HISTORY_URL, headers=HEADERS)
+    # The raw media type skips base64 and works past the contents API's 1 MB inline limit.
+    hist_status, store = gh_cache.get(HISTORY_URL, parse=parse_history, headers={"Accept": "application/vnd.github.raw"})
     
-    if hist_resp.status_code == 200:
-        file_data = hist_resp.json()
-        content_b64 = file_data['content']
-        file_sha = file_data['sha']
-        
-        decoded_content = base64.b64decode(content_b64).decode('utf-8')
-        history_data = json.loads(decoded_content)
-        
-        df = pd.DataFrame(history_data)
-        if not df.empty:
-            df['date'] = pd.to_datetime(df['date'])
-            df = df.sort_values(by="date", ascending=False).reset_index(drop=True)
-            
-            st.metric("Total Posts Published", len(df))
-            
+    if hist_status == 200:
+        if len(store):
+            st.metric("Total Posts Published", len(store))
+
+            col_range, col_page = st.columns([2, 1])
+            with col_range:
+                date_range = st.date_input("Published between:", value=(), key="archive_range")
+            start = str(date_range[0]) if len(date_range) > 0 else None
+            end = str(date_range[1]) if len(date_range) > 1 else start
+            total = store.query(start, end, per_page=1)[1]
+            pages = max(1, -(-total // ARCHIVE_PAGE_SIZE))
+            with col_page:
+                page = st.number_input(f"Page (of {pages}):", min_value=1, max_value=pages, value=1, key="archive_page")
+
+            rows, _ = store.query(start, end, page=page, per_page=ARCHIVE_PAGE_SIZE)
             st.dataframe(
-                df,
-                use_container_width=True,
+                [{"date": date.fromisoformat(r["date"]), "topic": r["topic"]} for r in rows],
+                width="stretch",
                 hide_index=True,
                 column_config={
                     "date": st.column_config.DateColumn("Published Date", format="MMM DD, YYYY", width="medium"),
@@ -180,9 +327,11 @@ with tab2:
             
             st.markdown("---")
             st.markdown("#### Danger Zone")
-            if st.button("🗑️ Delete History File", type="primary", help="Permanently deletes topic_history.json"):
+            if st.button("🗑️ Delete History File", type="primary", help=f"Permanently deletes {HISTORY_FILE}"):
                 with st.spinner("Deleting file from GitHub..."):
-                    delete_resp = requests.delete(HISTORY_URL, headers=HEADERS, json={"message": "Deleted topic_history.json via Streamlit UI", "sha": file_sha})
+                    file_sha = http_client.get(HISTORY_URL, headers=HEADERS).json().get("sha")
+                    delete_resp = http_client.delete(HISTORY_URL, headers=HEADERS, json={"message": f"Deleted {HISTORY_FILE} via Streamlit UI", "sha": file_sha})
+                    gh_cache.invalidate(HISTORY_URL)
                     if delete_resp.status_code == 200:
                         st.success("✅ History file deleted! The bot's memory is wiped.")
                         time.sleep(1)
@@ -196,6 +345,7 @@ with tab2:
 with tab3:
     st.markdown("### Let Claude generate 5 rapid-fire ideas.")
     theme = st.text_input("Enter a broad theme:", placeholder="e.g., Graph Algorithms, GenAI APIs, Clean Code")
+    fresh = st.checkbox("Fresh ideas (skip cache)")
     
     if st.button("🧠 Brainstorm Ideas"):
         if not theme:
@@ -203,25 +353,94 @@ with tab3:
         else:
             with st.spinner("Thinking..."):
                 try:
-                    bedrock = boto3.client(
-                        'bedrock-runtime', 
-                        region_name='us-east-1',
-                        aws_access_key_id=AWS_ACCESS_KEY_ID,
-                        aws_secret_access_key=AWS_SECRET_ACCESS_KEY
-                    )
+                    response_cache = get_response_cache()
                     prompt = f"Give me 5 highly specific, actionable LinkedIn post ideas about '{theme}' for backend developers. Output ONLY a numbered list."
-                    payload = {
-                        "anthropic_version": "bedrock-2023-05-31",
-                        "max_tokens": 500,
-                        "messages": [{"role": "user", "content": [{"type": "text", "text": prompt}]}]
-                    }
-                    response = bedrock.invoke_model(
-                        modelId="us.anthropic.claude-3-5-sonnet-20241022-v2:0", 
-                        body=json.dumps(payload)
+                    chunks = stream_claude(
+                        prompt,
+                        max_tokens=500,
+                        temperature=1.0,
+                        stage="brainstorm",
+                        client=get_bedrock(),
+                        cache=response_cache,
+                        use_cache=not fresh
                     )
-                    result = json.loads(response['body'].read())
-                    
-                    st.success("Done! Copy your favorite and paste it into the Generate tab.")
-                    st.markdown(result['content'][0]['text'])
+                    st.session_state.brainstorm_ideas = parse_topics(st.write_stream(chunks))
+                    st.session_state.pop("queue_picks", None)
+                    st.success("Done! Queue the ones you like below, or paste one into the Generate tab.")
+                    stats = response_cache.stats()
+                    st.caption(f"🗄️ Cache: {stats['hits']} hits / {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate)")
                 except Exception as e:
-                    st.error(f"AWS Error: {e}")
\ No newline at end of file
+                    st.error(f"AWS Error: {e}")
+
+    ideas = st.session_state.get("brainstorm_ideas")
+    if ideas:
+        picked = st.multiselect("Queue for upcoming drafts:", ideas, default=ideas, key="queue_picks")
+        if st.button("📥 Add to Topic Queue", disabled=not picked):
+            try:
+                added, queued = queue_topics(picked)
+                if added:
+                    st.success(f"✅ Queued {len(added)} topic(s). {queued} waiting for the drafter.")
+                else:
+                    st.info(f"Those topics are already queued. {queued} waiting for the drafter.")
+            except Exception as e:
+                st.error(f"Failed: {e}")
+
+# TAB 4: STAGE METRICS
+with tab4:
+    # Rendered on every run like the other tabs: st.dataframe loads pandas on the first render anyway, so gating this
+    # tab behind a rerun on tab switch saved nothing. The metrics file read goes through the GitHub read cache.
+    st.markdown("### 📈 Stage Latency & Token Spend")
+    metrics_status, records = gh_cache.get(METRICS_URL, parse=lambda resp: metrics.parse(resp.text),
+                                           headers={"Accept": "application/vnd.github.raw"})
+    if metrics_status != 200 or not records:
+        st.info("No metrics recorded yet. They appear after the next drafter or publisher run.")
+    else:
+        df = pd.DataFrame(records)
+        df['ts'] = pd.to_datetime(df['ts'])
+        df['day'] = df['ts'].dt.date
+        df['tokens'] = df['input_tokens'] + df['output_tokens']
+        if 'cost_usd' not in df:
+            df['cost_usd'] = 0.0
+
+        summary = df.groupby('stage').agg(
+            runs=('wall_time', 'size'),
+            p50_s=('wall_time', lambda s: s.quantile(0.5)),
+            p95_s=('wall_time', lambda s: s.quantile(0.95)),
+            input_tokens=('input_tokens', 'sum'),
+            output_tokens=('output_tokens', 'sum'),
+            cost_usd=('cost_usd', 'sum'),
+            retries=('retries', 'sum'),
+            errors=('outcome', lambda s: int((s != "ok").sum()))
+        ).round(2)
+        st.dataframe(summary, width="stretch")
+
+        col_latency, col_tokens = st.columns(2)
+        with col_latency:
+            st.markdown("#### p95 latency per day (s)")
+            st.line_chart(df.pivot_table(index='day', columns='stage', values='wall_time', aggfunc=lambda s: s.quantile(0.95)))
+        with col_tokens:
+            st.markdown("#### Tokens per day")
+            st.bar_chart(df.pivot_table(index='day', columns='stage', values='tokens', aggfunc='sum'))
+
+# SIDEBAR: rendered last so the numbers include this run's reads
+with st.sidebar:
+    st.markdown("### 🗄️ GitHub Read Cache")
+    cache_stats = gh_cache.stats()
+    st.metric("Hit Rate", f"{cache_stats['hit_rate']:.0%}")
+    st.metric("Requests Saved", cache_stats['saved_requests'])
+    st.metric("304 Not Modified", cache_stats['not_modified'])
+    latency = http_client.latency_stats()
+    if latency:
+        st.markdown("### ⏱️ HTTP Latency")
+        st.dataframe(
+            [{"endpoint": name, "calls": s["count"], "p50 ms": round(s["p50"] * 1000), "p95 ms": round(s["p95"] * 1000)}
+             for name, s in sorted(latency.items())],
+            hide_index=True
+        )
+    if st.session_state.get("last_report"):
+        st.caption(report_caption(st.session_state["last_report"]))
+    if st.button("🔄 Refresh from GitHub"):
+        gh_cache.invalidate()
+        st.rerun()
+
+startup_profile.report("first render")
@@ -0,0 +1,243 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import fake_services
+
+def summary(values):
+    values = sorted(values)
+    if not values:
+        return {"count": 0, "p50": None, "p95": None, "max": None}
+    return {
+        "count": len(values),
+        "p50": round(values[len(values) // 2], 4),
+        "p95": round(values[min(len(values) - 1, int(len(values) * 0.95))], 4),
+        "max": round(values[-1], 4)
+    }
+
+def read_metrics(metrics_path):
+    import metrics
+    with open(metrics_path) as f:
+        return metrics.parse(f.read())
+
+def stage_summaries(metrics_path, names):
+    records = read_metrics(metrics_path)
+    wall = defaultdict(list)
+    for r in records:
+        wall[r["stage"]].append(r["wall_time"])
+    return {name: summary(wall[name]) for name in names}
+
+def draft_body(topic, words=400):
+    article = "# " + topic + "\n\n" + " ".join(f"word{i}" for i in range(words))
+    return f"🤖 Draft generated for topic: {topic}\n\n---HASHNODE_ARTICLE---\n{article}\n---LINKEDIN_POST---\nPost about {topic}\n---END---\n"
+
+def bench_draft(args, bedrock):
+    import draft_agent
+    from metrics import METRICS_FILE
+    # Email has no local stand-in; a sleep of one service round trip takes its place.
+    draft_agent.send_notification_email = lambda *a, **kw: time.sleep(args.latency)
+
+    start = time.perf_counter()
+    topic_pool = draft_agent.TopicPool()
+    topics = draft_agent.pick_topics(draft_agent.load_topic_history(), args.drafts, topic_pool)
+
+    def draft(topic):
+        t = time.perf_counter()
+        draft_agent.draft_topic(topic, topic_pool)
+        return time.perf_counter() - t
+
+    durations, failures = [], 0
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for future in [pool.submit(draft, topic) for topic in topics]:
+            try:
+                durations.append(future.result())
+            except Exception as e:
+                failures += 1
+                print(f"❌ draft failed: {e}")
+    draft_agent.top_up_pool(topic_pool, [h['topic'] for h in draft_agent.load_topic_history()] + topics)
+    seconds = time.perf_counter() - start
+    records = read_metrics(METRICS_FILE)
+    return {
+        "drafts": len(topics),
+        "failures": failures,
+        "seconds": round(seconds, 3),
+        "per_minute": round(len(durations) * 60 / seconds, 2),
+        "latency": summary(durations),
+        "stages": stage_summaries(METRICS_FILE, ["topic", "linkedin", "hashnode", "issue", "email"]),
+        "llm_calls": len(bedrock.calls),
+        "cost_usd": round(sum(r.get("cost_usd", 0) for r in records), 4),
+        "cache_read_input_tokens": sum(r.get("cache_read_input_tokens", 0) for r in records),
+        "cache_creation_input_tokens": sum(r.get("cache_creation_input_tokens", 0) for r in records)
+    }
+
+def bench_publish(args, github, linkedin):
+    import publish_agent
+    from metrics import METRICS_FILE
+    github.state["issues"].clear()
+    for i in range(args.issues):
+        fake_services.add_issue(github.state, f"Draft: Publish bench {i}", draft_body(f"Publish bench {i}"), ["draft", "publish"])
+
+    start = time.perf_counter()
+    results = publish_agent.publish_batch(args.concurrency, 0.0)
+    seconds = time.perf_counter() - start
+    published = sum(1 for r in results if r["post_id"])
+    return {
+        "issues": args.issues,
+        "published": published,
+        "failures": sum(1 for r in results if r["error"]),
+        "seconds": round(seconds, 3),
+        "per_minute": round(published * 60 / seconds, 2),
+        "latency": stage_summaries(METRICS_FILE, ["publish"])["publish"],
+        "linkedin_posts": len(linkedin.state["posts"])
+    }
+
+def bench_app(args, github, hashnode):
+    from streamlit.testing.v1 import AppTest
+    github.state["issues"].clear()
+    for i in range(args.issues):
+        fake_services.add_issue(github.state, f"Draft: Dashboard bench {i}", draft_body(f"Dashboard bench {i}"), ["draft"])
+    first = date(2020, 1, 1)
+    history = "".join(json.dumps({"date": str(first + timedelta(days=i // 3)), "topic": f"History row {i}"}) + "\n"
+                      for i in range(args.history))
+    with open("metrics.jsonl", "rb") as f:
+        github.state["files"]["metrics.jsonl"] = f.read()
+    github.state["files"]["topic_history.jsonl"] = history.encode()
+
+    at = AppTest.from_file(os.path.join(REPO_DIR, "app.py"), default_timeout=120)
+    for key in ["GITHUB_PAT", "REPO_OWNER", "REPO_NAME", "AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY",
+                "HASHNODE_TOKEN", "HASHNODE_PUBLICATION_ID"]:
+        at.secrets[key] = "bench"
+
+    def timed(step):
+        t = time.perf_counter()
+        step()
+        return round(time.perf_counter() - t, 4)
+
+    newest = args.issues  # the dashboard lists newest first
+    report = {
+        "issues": args.issues,
+        "history_rows": args.history,
+        "cold_render": timed(at.run),
+        "warm_render": timed(at.run),
+        "open_draft": timed(lambda: at.toggle(key=f"open_{newest}").set_value(True).run()),
+        "publish_blog": timed(lambda: at.button(key=f"pub_blog_{newest}").click().run()),
+    }
+    report["exceptions"] = [e.message for e in at.exception]
+    report["hashnode_posts"] = len(hashnode.state["posts"])
+    return report
+
+def flatten(obj, prefix=""):
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            yield from flatten(value, f"{prefix}{key}.")
+    elif isinstance(obj, (int, float)) and not isinstance(obj, bool):
+        yield prefix.rstrip("."), obj
+
+def compare(old, new):
+    before = dict(flatten(old["results"]))
+    for name, value in flatten(new["results"]):
+        if before.get(name) in (None, 0):
+            continue
+        change = (value - before[name]) / before[name] * 100
+        print(f"  {name:40} {before[name]:>10} → {value:<10} ({change:+.1f}%)")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the drafter, publisher and dashboard against local fakes.")
+    parser.add_argument("--drafts", type=int, default=3, help="Drafts generated by the draft pipeline")
+    parser.add_argument("--issues", type=int, default=20, help="Issues for the publish batch and the dashboard")
+    parser.add_argument("--history", type=int, default=5000, help="History rows served to the dashboard")
+    parser.add_argument("--concurrency", type=int, default=3, help="Worker count for drafting and publishing")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every fake service call")
+    parser.add_argument("--token-latency", type=float, default=0.0005, help="Seconds per generated word from the fake Bedrock")
+    parser.add_argument("--article-tokens", type=int, default=3000, help="Length of the fake Hashnode article")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of fake calls that fail and get retried")
+    parser.add_argument("--only", choices=["draft", "publish", "app"], action="append", help="Run only these benchmarks")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--compare", help="Print the change against an earlier --json file")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    only = args.only or ["draft", "publish", "app"]
+    json_path = os.path.abspath(args.json) if args.json else None
+    compare_path = os.path.abspath(args.compare) if args.compare else None
+
+    github = fake_services.start(fake_services.GitHubHandler, args.latency, args.failure_rate)
+    linkedin = fake_services.start(fake_services.LinkedInHandler, args.latency, args.failure_rate)
+    hashnode = fake_services.start(fake_services.HashnodeHandler, args.latency, args.failure_rate)
+    bedrock = fake_services.FakeBedrock(args.latency, args.token_latency, args.failure_rate, args.article_tokens)
+
+    # The agents read their endpoints and file paths when imported, so this has to come before any repo import.
+    os.environ.update({
+        "GITHUB_API_URL": github.url,
+        "LINKEDIN_API_URL": linkedin.url,
+        "HASHNODE_API_URL": f"{hashnode.url}/",
+        "GITHUB_REPOSITORY": "bench/repo",
+        "GITHUB_TOKEN": "bench",
+        "LINKEDIN_ACCESS_TOKEN": "bench",
+        "LINKEDIN_USER_URN": "urn:li:person:bench",
+        "LLM_CACHE_BYPASS": "1",
+        "HTTP_MAX_RETRIES": "4"
+    })
+    os.environ.pop("CORRELATION_ID", None)
+    workdir = tempfile.mkdtemp(prefix="e2e_bench_")
+    for name in ["topic_history.jsonl", "topic_index.npz", "topic_pool.jsonl"]:
+        shutil.copy(os.path.join(REPO_DIR, name), workdir)
+    os.chdir(workdir)
+    open("metrics.jsonl", "w").close()
+
+    import llm
+    import http_client
+    llm.set_client(bedrock)
+
+    results = {}
+    if "draft" in only:
+        results["draft"] = bench_draft(args, bedrock)
+    if "publish" in only:
+        results["publish"] = bench_publish(args, github, linkedin)
+    if "app" in only:
+        results["app"] = bench_app(args, github, hashnode)
+    results["http"] = http_client.latency_stats()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    commit = subprocess.run(["git", "-C", REPO_DIR, "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    print(f"\ncommit: {commit or 'unknown'}  latency: {args.latency}s  failure rate: {args.failure_rate}")
+    if "draft" in results:
+        d = results["draft"]
+        print(f"draft:   {d['drafts']} drafts in {d['seconds']:.2f}s ({d['per_minute']}/min), "
+              f"p50 {d['latency']['p50']}s, p95 {d['latency']['p95']}s, {d['failures']} failed, {d['llm_calls']} LLM calls, "
+              f"${d['cost_usd']}, cache {d['cache_read_input_tokens']} read/{d['cache_creation_input_tokens']} written")
+        for name, s in d["stages"].items():
+            print(f"  {name:9} p50 {s['p50']}s  p95 {s['p95']}s  ({s['count']} runs)")
+    if "publish" in results:
+        p = results["publish"]
+        print(f"publish: {p['published']}/{p['issues']} issues in {p['seconds']:.2f}s ({p['per_minute']}/min), "
+              f"p50 {p['latency']['p50']}s, p95 {p['latency']['p95']}s, {p['failures']} failed")
+    if "app" in results:
+        a = results["app"]
+        print(f"app:     {a['issues']} drafts, {a['history_rows']} history rows: cold {a['cold_render']}s, warm {a['warm_render']}s, "
+              f"open draft {a['open_draft']}s, publish blog {a['publish_blog']}s, {len(a['exceptions'])} exception(s)")
+    for name, s in results["http"].items():
+        print(f"  {name}: {s['count']} calls, p50 {s['p50']:.3f}s, p95 {s['p95']:.3f}s")
+
+    output = {"commit": commit, "config": vars(args), "results": results}
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(output, f, indent=2)
+        print(f"📝 Wrote {json_path}")
+    if compare_path:
+        with open(compare_path) as f:
+            previous = json.load(f)
+        print(f"\nchange since {previous.get('commit') or 'previous run'}:")
+        compare(previous, output)
@@ -0,0 +1,380 @@
+import re
+import io
+import base64
+import hashlib
+import sys
+import json
+import time
+import random
+import threading
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from botocore.exceptions import ClientError
+
+class FakeHandler(BaseHTTPRequestHandler):
+    # Per-server knobs, set through start(): added latency in seconds and the share of requests that fail.
+    latency = 0.0
+    failure_rate = 0.0
+    failure_status = 503
+    state = None
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, status, obj=None, headers=None):
+        body = b"" if obj is None else json.dumps(obj).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def handle_one(self, method):
+        time.sleep(self.latency)
+        with self.state["lock"]:
+            self.state["requests"] += 1
+        if random.random() < self.failure_rate:
+            return self.send_json(self.failure_status, {"message": "injected failure"}, {"Retry-After": "0"})
+        getattr(self, f"route_{method}", lambda: self.send_json(405))()
+
+    def do_GET(self):
+        self.handle_one("GET")
+
+    def do_POST(self):
+        self.handle_one("POST")
+
+    def do_PATCH(self):
+        self.handle_one("PATCH")
+
+    def do_PUT(self):
+        self.handle_one("PUT")
+
+    def do_DELETE(self):
+        self.handle_one("DELETE")
+
+class LinkedInHandler(FakeHandler):
+    def route_POST(self):
+        if urlsplit(self.path).path != "/v2/ugcPosts":
+            return self.send_json(404, {"message": "not found"})
+        payload = self.read_json()
+        with self.state["lock"]:
+            post_id = f"urn:li:share:{len(self.state['posts']) + 1}"
+            self.state["posts"].append({"id": post_id, "at": time.time(), "payload": payload})
+        self.send_json(201, {"id": post_id})
+
+class HashnodeHandler(FakeHandler):
+    def route_POST(self):
+        payload = self.read_json()
+        if "publishPost" not in payload.get("query", ""):
+            return self.send_json(200, {"errors": [{"message": "unsupported query"}]})
+        with self.state["lock"]:
+            url = f"https://hashnode.example/post-{len(self.state['posts']) + 1}"
+            self.state["posts"].append({"url": url, "at": time.time(), "input": payload["variables"]["input"]})
+        self.send_json(200, {"data": {"publishPost": {"post": {"url": url}}}})
+
+class GitHubHandler(FakeHandler):
+    def _issue(self, number):
+        return next((i for i in self.state["issues"] if i["number"] == number), None)
+
+    def contents(self, path):
+        with self.state["lock"]:
+            data = self.state["files"].get(path)
+        if data is None:
+            return self.send_json(404, {"message": "Not Found"})
+        sha = hashlib.sha1(data).hexdigest()
+        if self.headers.get("If-None-Match") == f'"{sha}"':
+            return self.send_json(304, headers={"ETag": f'"{sha}"'})
+        if "raw" in self.headers.get("Accept", ""):
+            self.send_response(200)
+            self.send_header("ETag", f'"{sha}"')
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            return self.wfile.write(data)
+        self.send_json(200, {"path": path, "sha": sha, "content": base64.b64encode(data).decode()}, {"ETag": f'"{sha}"'})
+
+    def route_GET(self):
+        parts = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        contents = re.fullmatch(r"/repos/[^/]+/[^/]+/contents/(.+)", parts.path)
+        if contents:
+            return self.contents(contents.group(1))
+        match = re.fullmatch(r"/repos/[^/]+/[^/]+/issues(?:/(\d+))?(/comments)?", parts.path)
+        if not match:
+            return self.send_json(404, {"message": "Not Found"})
+        if match.group(2):
+            with self.state["lock"]:
+                return self.send_json(200, list(self.state["comments"].get(int(match.group(1)), [])))
+        if match.group(1):
+            issue = self._issue(int(match.group(1)))
+            return self.send_json(200 if issue else 404, issue or {"message": "Not Found"})
+
+        labels = set(filter(None, query.get("labels", "").split(",")))
+        state = query.get("state", "open")
+        with self.state["lock"]:
+            issues = [i for i in self.state["issues"]
+                      if labels <= {l["name"] for l in i["labels"]} and state in ("all", i["state"])]
+        per_page = int(query.get("per_page", 30))
+        page = int(query.get("page", 1))
+        headers = {}
+        if page * per_page < len(issues):
+            query.update(page=str(page + 1))
+            next_url = f"http://{self.headers['Host']}{parts.path}?" + "&".join(f"{k}={v}" for k, v in query.items())
+            headers["Link"] = f'<{next_url}>; rel="next"'
+        self.send_json(200, issues[(page - 1) * per_page:page * per_page], headers)
+
+    def graphql(self, payload):
+        # Understands just the label lookups and issue mutations the agents send, keyed by node id "I_<number>".
+        query, variables = payload["query"], payload.get("variables") or {}
+        data = {}
+        with self.state["lock"]:
+            if query.lstrip().startswith("query") and "issues(" in query:
+                wanted = set(variables.get("labels") or [])
+                matching = [i for i in reversed(self.state["issues"])
+                            if i["state"] == "open" and wanted <= {l["name"] for l in i["labels"]}]
+                start = int(variables.get("after") or 0)
+                end = start + variables["first"]
+                nodes = [{"id": i["node_id"], "number": i["number"], "title": i["title"],
+                          "updatedAt": i["updated_at"], "url": i["html_url"]} for i in matching[start:end]]
+                page_info = {"hasNextPage": end < len(matching), "endCursor": str(end)}
+                data["repository"] = {"issues": {"nodes": nodes, "pageInfo": page_info}}
+                return self.send_json(200, {"data": data})
+            if query.lstrip().startswith("query"):
+                labels = re.findall(r'(\w+): label\(name: "([^"]+)"\)', query)
+                data["repository"] = {alias: {"id": f"LA_{name}"} if name in self.state["labels"] else None
+                                      for alias, name in labels}
+                return self.send_json(200, {"data": data})
+
+            issue = self._issue(int(variables["id"].split("_")[1]))
+            if not issue:
+                return self.send_json(200, {"errors": [{"message": "Could not resolve to a node"}]})
+            for alias, field in re.findall(r"(\w+): (\w+)\(input", query):
+                if field == "updateIssue":
+                    issue["body"] = variables["body"]
+                elif field == "addLabelsToLabelable":
+                    issue["labels"] += [{"name": i[3:]} for i in variables["add"]]
+                elif field == "removeLabelsFromLabelable":
+                    removed = {i[3:] for i in variables["remove"]}
+                    issue["labels"] = [l for l in issue["labels"] if l["name"] not in removed]
+                elif field == "addComment":
+                    add_comment(self.state, issue, variables[alias])
+                elif field == "closeIssue":
+                    issue["state"] = "closed"
+                data[alias] = {"clientMutationId": None}
+            issue["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        self.send_json(200, {"data": data})
+
+    def route_POST(self):
+        path = urlsplit(self.path).path
+        payload = self.read_json()
+        if path == "/graphql":
+            return self.graphql(payload)
+        match = re.fullmatch(r"/repos/[^/]+/[^/]+/issues/(\d+)/(comments|labels)", path)
+        if match:
+            issue = self._issue(int(match.group(1)))
+            if not issue:
+                return self.send_json(404, {"message": "Not Found"})
+            with self.state["lock"]:
+                if match.group(2) == "comments":
+                    return self.send_json(201, add_comment(self.state, issue, payload["body"]))
+                issue["labels"] += [{"name": n} for n in payload["labels"]]
+                self.state["labels"].update(payload["labels"])
+            return self.send_json(200, issue["labels"])
+
+        if re.fullmatch(r"/repos/[^/]+/[^/]+/labels", path):
+            with self.state["lock"]:
+                if payload["name"] in self.state["labels"]:
+                    return self.send_json(422, {"message": "Validation Failed", "errors": [{"code": "already_exists"}]})
+                self.state["labels"].add(payload["name"])
+            return self.send_json(201, {"name": payload["name"], "node_id": f"LA_{payload['name']}"})
+        if re.fullmatch(r"/repos/[^/]+/[^/]+/issues", path):
+            issue = add_issue(self.state, payload["title"], payload.get("body", ""), payload.get("labels", []))
+            return self.send_json(201, issue)
+        self.send_json(404, {"message": "Not Found"})
+
+    def route_PUT(self):
+        # Contents API create/update: updating needs the current blob sha, a stale one is a 409 like on GitHub.
+        contents = re.fullmatch(r"/repos/[^/]+/[^/]+/contents/(.+)", urlsplit(self.path).path)
+        if not contents:
+            return self.send_json(404, {"message": "Not Found"})
+        payload = self.read_json()
+        path = contents.group(1)
+        with self.state["lock"]:
+            current = self.state["files"].get(path)
+            if current is not None and payload.get("sha") != hashlib.sha1(current).hexdigest():
+                return self.send_json(409, {"message": f"{path} does not match {payload.get('sha')}"})
+            if current is None and payload.get("sha"):
+                return self.send_json(404, {"message": "Not Found"})
+            data = base64.b64decode(payload["content"])
+            self.state["files"][path] = data
+        self.send_json(201 if current is None else 200, {"content": {"path": path, "sha": hashlib.sha1(data).hexdigest()}})
+
+    def route_PATCH(self):
+        match = re.fullmatch(r"/repos/[^/]+/[^/]+/issues/(\d+)", urlsplit(self.path).path)
+        issue = self._issue(int(match.group(1))) if match else None
+        if not issue:
+            return self.send_json(404, {"message": "Not Found"})
+        with self.state["lock"]:
+            issue.update(self.read_json())
+        self.send_json(200, issue)
+
+    def route_DELETE(self):
+        match = re.fullmatch(r"/repos/[^/]+/[^/]+/issues/(\d+)/labels/([^/]+)", urlsplit(self.path).path)
+        issue = self._issue(int(match.group(1))) if match else None
+        if not issue:
+            return self.send_json(404, {"message": "Not Found"})
+        with self.state["lock"]:
+            issue["labels"] = [l for l in issue["labels"] if l["name"] != match.group(2)]
+        self.send_json(200, issue["labels"])
+
+# Shortest prefix Bedrock will cache per model, in tokens; a checkpoint before this point is ignored.
+MIN_CACHE_TOKENS = {
+    "claude-sonnet-4-5": 1024,
+    "claude-opus-4-5": 4096,
+    "claude-haiku-4-5": 4096
+}
+DEFAULT_MIN_CACHE_TOKENS = 1024
+
+def min_cache_tokens(model_id):
+    return next((n for name, n in MIN_CACHE_TOKENS.items() if name in model_id), DEFAULT_MIN_CACHE_TOKENS)
+
+class FakeBedrock:
+    # Stands in for the boto3 bedrock-runtime client. A call takes `latency` plus `token_latency` per output word;
+    # failures are throttles that count as SDK retries until `max_attempts` is reached, then raise like boto3 does.
+    def __init__(self, latency=0.0, token_latency=0.0, failure_rate=0.0, article_tokens=3000, max_attempts=3):
+        self.latency = latency
+        self.token_latency = token_latency
+        self.failure_rate = failure_rate
+        self.article_tokens = article_tokens
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        self.calls = []
+        self.cached = set()
+
+    def output_words(self, prompt):
+        count = re.search(r"Return exactly (\d+) topic titles", prompt)
+        if count:
+            return [w for _ in range(int(count.group(1)))
+                    for w in ["Synthetic"] + [f"w{random.randrange(10 ** 6)}" for _ in range(6)] + [f"w{random.randrange(10 ** 6)}\n"]]
+        if "Return ONLY the topic title" in prompt:
+            return ["Synthetic"] + [f"w{random.randrange(10 ** 6)}" for _ in range(7)]
+        count = self.article_tokens if "Hashnode" in prompt else 250
+        # One entry per whitespace-separated word, so a continuation can skip exactly what its prefill holds.
+        return ["#", "Title"] + [f"word{i}" for i in range(count - 2)]
+
+    def cache_usage(self, model_id, payload):
+        # Mimics prompt caching: the prefix up to the last cache_control block is read from the longest block
+        # boundary seen before and written for the rest. Each model has its own cache, and a cache_control block
+        # whose prefix is shorter than the model's minimum (one word per token here) is not cached at all.
+        blocks = list(payload.get("system", [])) + [b for m in payload["messages"] for b in m["content"]]
+        keys, words, total = [], [], 0
+        for block in blocks:
+            total += len(block["text"].split())
+            prefix = "\0".join([model_id] + [b["text"] for b in blocks[:len(keys) + 1]])
+            keys.append(hashlib.sha1(prefix.encode()).hexdigest())
+            words.append(total)
+        minimum = min_cache_tokens(model_id)
+        marked = [i for i, b in enumerate(blocks) if "cache_control" in b and words[i] >= minimum]
+        if not marked:
+            return {"input_tokens": total}
+        last = marked[-1]
+        with self.lock:
+            read = max([words[i] for i in range(last + 1) if keys[i] in self.cached] or [0])
+            self.cached.update(keys[i] for i in marked)
+        return {"input_tokens": total - words[last], "cache_read_input_tokens": read,
+                "cache_creation_input_tokens": words[last] - read}
+
+    def respond(self, model_id, body):
+        payload = json.loads(body)
+        system = " ".join(b["text"] for b in payload.get("system", []))
+        prompt = system + " " + payload["messages"][0]["content"][0]["text"]
+        prefill = "".join(b["text"] for b in payload["messages"][1]["content"]) if len(payload["messages"]) > 1 else ""
+        words = self.output_words(prompt)[len(prefill.split()):]
+        stop_reason = "end_turn"
+        if len(words) > payload["max_tokens"]:
+            words = words[:payload["max_tokens"]]
+            stop_reason = "max_tokens"
+
+        retries = 0
+        while random.random() < self.failure_rate:
+            time.sleep(self.latency)
+            retries += 1
+            if retries == self.max_attempts:
+                raise ClientError({"Error": {"Code": "ThrottlingException", "Message": "injected failure"}}, "InvokeModel")
+        time.sleep(self.latency + self.token_latency * len(words))
+        usage = {**self.cache_usage(model_id, payload), "output_tokens": len(words)}
+        with self.lock:
+            self.calls.append({"model_id": model_id, "usage": usage, "stop_reason": stop_reason, "retries": retries})
+        text = ("" if not prefill else " ") + " ".join(words)
+        return text, stop_reason, usage, {"RetryAttempts": retries}
+
+    def invoke_model(self, modelId, body):
+        text, stop_reason, usage, meta = self.respond(modelId, body)
+        result = {"content": [{"type": "text", "text": text}], "stop_reason": stop_reason, "usage": usage}
+        return {"body": io.BytesIO(json.dumps(result).encode()), "ResponseMetadata": meta}
+
+    def invoke_model_with_response_stream(self, modelId, body):
+        text, stop_reason, usage, meta = self.respond(modelId, body)
+        events = [{"type": "message_start", "message": {"usage": {k: v for k, v in usage.items() if k != "output_tokens"}}}]
+        events += [{"type": "content_block_delta", "delta": {"type": "text_delta", "text": text[i:i + 40]}}
+                   for i in range(0, len(text), 40)]
+        events.append({"type": "message_delta", "delta": {"stop_reason": stop_reason},
+                       "usage": {"output_tokens": usage["output_tokens"]}})
+        return {"body": [{"chunk": {"bytes": json.dumps(e).encode()}} for e in events], "ResponseMetadata": meta}
+
+def new_state():
+    return {"lock": threading.Lock(), "requests": 0, "posts": [], "issues": [], "files": {}, "comments": {}, "labels": set()}
+
+def add_issue(state, title, body, labels):
+    with state["lock"]:
+        number = len(state["issues"]) + 1
+        issue = {
+            "id": 1000 + number,
+            "number": number,
+            "node_id": f"I_{number}",
+            "title": title,
+            "body": body,
+            "state": "open",
+            "labels": [{"name": n} for n in labels],
+            "comments": 0,
+            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "html_url": f"https://github.example/issues/{number}"
+        }
+        state["issues"].append(issue)
+        state["labels"].update(labels)
+    return issue
+
+def add_comment(state, issue, body):
+    # Callers hold the state lock.
+    issue["comments"] += 1
+    comment = {"id": issue["comments"], "body": body}
+    state["comments"].setdefault(issue["number"], []).append(comment)
+    return comment
+
+def start(handler, latency=0.0, failure_rate=0.0, state=None, port=0):
+    state = state or new_state()
+    cls = type(handler.__name__, (handler,), {"latency": latency, "failure_rate": failure_rate, "state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", port), cls)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    server.state = state
+    return server
+
+if __name__ == "__main__":
+    latency = float(sys.argv[1]) if len(sys.argv) > 1 else 0.0
+    linkedin = start(LinkedInHandler, latency=latency, port=8081)
+    github = start(GitHubHandler, latency=latency, port=8082)
+    hashnode = start(HashnodeHandler, latency=latency, port=8083)
+    print(f"LINKEDIN_API_URL={linkedin.url}")
+    print(f"GITHUB_API_URL={github.url}")
+    print(f"HASHNODE_API_URL={hashnode.url}/")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
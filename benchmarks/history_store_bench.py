@@ -0,0 +1,58 @@
+import os
+import sys
+import json
+import time
+import tempfile
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history_store import HistoryStore, migrate_json
+
+ENTRIES = int(os.environ.get("BENCH_ENTRIES") or 100_000)
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+def legacy_append(path, topic):
+    with open(path, "r") as f:
+        history = json.load(f)
+    history.append({"date": str(date.today()), "topic": topic})
+    with open(path, "w") as f:
+        json.dump(history, f, indent=2)
+
+if __name__ == "__main__":
+    first = date(2000, 1, 1)
+    history = [{"date": str(first + timedelta(days=i // 3)), "topic": f"Topic number {i} about distributed systems"}
+               for i in range(ENTRIES)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "topic_history.json")
+        jsonl_path = os.path.join(tmp, "topic_history.jsonl")
+        with open(json_path, "w") as f:
+            json.dump(history, f, indent=2)
+
+        _, migrate_ms = timed(lambda: migrate_json(json_path, jsonl_path))
+        _, legacy_ms = timed(lambda: legacy_append(json_path, "One more topic"))
+        store, load_ms = timed(lambda: HistoryStore(jsonl_path))
+        _, append_ms = timed(lambda: store.append("One more topic"))
+
+        reader = HistoryStore(jsonl_path)
+        HistoryStore(jsonl_path).append("Appended by another process")
+        new, refresh_ms = timed(reader.refresh)
+
+        mid = str(first + timedelta(days=ENTRIES // 6))
+        end = str(first + timedelta(days=ENTRIES // 6 + 30))
+        (rows, total), range_ms = timed(lambda: store.query(mid, end, page=2, per_page=25))
+        _, page_ms = timed(lambda: store.query(page=ENTRIES // 50, per_page=25))
+
+        print(f"entries:                      {ENTRIES}")
+        print(f"one-time migration:           {migrate_ms:8.1f} ms")
+        print(f"legacy JSON append (rewrite): {legacy_ms:8.1f} ms")
+        print(f"JSONL append:                 {append_ms:8.3f} ms")
+        print(f"full load + index:            {load_ms:8.1f} ms")
+        print(f"incremental refresh ({len(new)} new): {refresh_ms:8.3f} ms")
+        print(f"range query page ({total} hits): {range_ms:8.3f} ms")
+        print(f"deep page query:              {page_ms:8.3f} ms")
@@ -0,0 +1,46 @@
+import os
+import sys
+import time
+import random
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from draft_agent import RECENT_TOPICS, NEAREST_TOPICS, MAX_TOPIC_ATTEMPTS, topic_prompt
+from topic_index import TopicIndex
+
+WORDS = (
+    "kafka redis postgres sharding caching idempotency saga outbox rag embeddings vector bedrock agents "
+    "latency throughput backpressure consistency replication partitioning retries circuit breaker bulkhead "
+    "pagination cursor index compaction streaming batching tokens prompts routing fallback locking queues"
+).split()
+
+def fake_topic(rng):
+    return "Implementing " + " ".join(rng.sample(WORDS, 8)).title() + f" #{rng.randint(0, 10**6)}"
+
+if __name__ == "__main__":
+    rng = random.Random(0)
+    print(f"{'history':>8} {'old prompt':>11} {'new prompt':>11} {'build s':>8} {'query ms':>9} {'index KB':>9}")
+    for n in (100, 1000, 10000, 20000):
+        topics = [fake_topic(rng) for _ in range(n)]
+
+        old_prompt = len(topic_prompt(topics))
+        # Worst case: every attempt is rejected and adds its neighbours to the avoid list.
+        avoid = topics[-RECENT_TOPICS:] + topics[:MAX_TOPIC_ATTEMPTS * (NEAREST_TOPICS + 1)]
+        new_prompt = len(topic_prompt(avoid))
+
+        start = time.perf_counter()
+        index = TopicIndex(topics)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(20):
+            index.nearest(fake_topic(rng), k=NEAREST_TOPICS)
+        query = (time.perf_counter() - start) / 20 * 1000
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.npz")
+            index.save(path)
+            size = os.path.getsize(path) / 1024
+
+        print(f"{n:>8} {old_prompt:>11} {new_prompt:>11} {build:>8.2f} {query:>9.2f} {size:>9.0f}")
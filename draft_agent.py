@@ -1,46 +1,37 @@
+import startup_profile
 import os
-import json
-import boto3
+import re
+import time
 import smtplib
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
-from github import Github
-from botocore.exceptions import ClientError
-
-HISTORY_FILE = "topic_history.json"
-MODEL_ID = "us.anthropic.claude-opus-4-5-20251101-v1:0"
-AWS_REGION = "us-east-1" 
-
-bedrock = boto3.client(
-    service_name='bedrock-runtime',
-    region_name=AWS_REGION,
-    aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
-    aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY')
-)
-
-def invoke_claude(prompt, max_tokens=2000):
-    payload = {
-        "anthropic_version": "bedrock-2023-05-31",
-        "max_tokens": max_tokens,
-        "temperature": 0.7,
-        "messages": [{"role": "user", "content": [{"type": "text", "text": prompt}]}]
-    }
-    try:
-        response = bedrock.invoke_model(modelId=MODEL_ID, body=json.dumps(payload))
-        result = json.loads(response['body'].read())
-        return result['content'][0]['text']
-    except ClientError as e:
-        print(f"AWS Error: {e}")
-        raise
+import http_client
+from http_client import GITHUB_API, github_headers
+from llm import invoke_claude, invoke_claude_continued
+from response_cache import response_cache
+from topic_index import TopicIndex, SIMILARITY_THRESHOLD
+from job_tracker import correlation_marker
+from history_store import HistoryStore
+from topic_pool import TopicPool, MIN_SIZE, refill
+import metrics
+
+PARTIAL_DIR = "partial_drafts"
+RECENT_TOPICS = 20
+NEAREST_TOPICS = 5
+MAX_TOPIC_ATTEMPTS = 3
+HASHNODE_CHUNK_TOKENS = int(os.environ.get("HASHNODE_CHUNK_TOKENS") or 4000)
+HASHNODE_TOKEN_BUDGET = int(os.environ.get("HASHNODE_TOKEN_BUDGET") or 16000)
+
+def partial_path(topic, stage):
+    slug = re.sub(r"[^a-z0-9]+", "-", topic.lower()).strip("-")[:80]
+    return os.path.join(PARTIAL_DIR, f"{slug}.{stage}.md")
 
 def load_topic_history():
-    if not os.path.exists(HISTORY_FILE):
-        return []
-    with open(HISTORY_FILE, "r") as f:
-        return json.load(f)
-
-def get_unique_topic(history):
-    past_topics = [h['topic'] for h in history]
-    prompt = f"""
+    return HistoryStore().entries
+
+def topic_prompt(past_topics):
+    return f"""
     You are an Expert Developer Advocate and Senior Staff Engineer. 
     Your task is to suggest a single, highly specific technical topic for a LinkedIn post.
 
@@ -56,11 +47,23 @@ def get_unique_topic(history):
     Output Requirement:
     Return ONLY the topic title. Do not include quotes, preambles, or explanations.
     """
-    return invoke_claude(prompt).strip()
 
-def generate_linkedin_post(topic):
-    prompt = f"""
-    Write a LinkedIn post about: "{topic}".
+def get_unique_topic(history, index=None):
+    # Only recent topics go into the prompt; the index catches repeats of anything older.
+    index = index or TopicIndex.load([h['topic'] for h in history])
+    avoid = [h['topic'] for h in history[-RECENT_TOPICS:]]
+    for _ in range(MAX_TOPIC_ATTEMPTS):
+        candidate = invoke_claude(topic_prompt(avoid), stage="topic").strip()
+        nearest = index.nearest(candidate, k=NEAREST_TOPICS)
+        if not nearest or nearest[0][1] < SIMILARITY_THRESHOLD:
+            return candidate
+        print(f"♻️ Rejected '{candidate}' ({nearest[0][1]:.2f} similar to '{nearest[0][0]}')")
+        avoid += [candidate] + [t for t, _ in nearest if t not in avoid]
+    raise ValueError(f"No unique topic found after {MAX_TOPIC_ATTEMPTS} attempts")
+
+# The rule blocks never change, so they go in the system prompt where Bedrock can cache them; only the topic varies.
+LINKEDIN_SYSTEM_PROMPT = """
+    You write LinkedIn posts about the topic given in the user message.
     
     CRITICAL "Grounded Reality" Rule: 
     DO NOT invent fake startup metrics, massive cloud bills (e.g., "$800 API costs"), or fake user bases. Do not pretend to be a founder. Frame your "struggles" around standard developer realities: debugging a tricky issue, optimizing a local script, reading documentation, or a standard team architecture discussion. Keep the stakes realistic.
@@ -84,12 +87,10 @@ def generate_linkedin_post(topic):
 
     Output the raw text only. No introductory or concluding remarks. Just the post content.
     """
-    return invoke_claude(prompt, max_tokens=2200)
 
-def generate_hashnode_article(topic, linkedin_summary):
-    prompt = f"""
+HASHNODE_SYSTEM_PROMPT = """
     You are a Senior Software Engineer writing a deep-dive technical blog post for Hashnode for Beginners/Freshers on this Software Engineering domain.
-    The topic is: "{topic}". 
+    The topic is given in the user message.
     
     CRITICAL CONTENT RULES (READ CAREFULLY):
     1. PURE KNOWLEDGE TRANSFER: Do NOT use fake personal anecdotes, fake company scenarios, or phrases like "last week our service faced this" or "my team". Write this as a highly objective, educational deep dive.
@@ -106,30 +107,48 @@ def generate_hashnode_article(topic, linkedin_summary):
     
     Output ONLY the Markdown content. Start directly with the `# Title`.
     """
-    return invoke_claude(prompt, max_tokens=8000)
 
-def create_review_issue(topic, linkedin_content, hashnode_content):
-    g = Github(os.environ["GITHUB_TOKEN"])
-    repo = g.get_repo(os.environ["GITHUB_REPOSITORY"])
+def generate_linkedin_post(topic):
+    return invoke_claude(f'Write a LinkedIn post about: "{topic}".', max_tokens=2200, system=LINKEDIN_SYSTEM_PROMPT,
+                         partial_path=partial_path(topic, "linkedin"), stage="linkedin")
+
+def generate_hashnode_article(topic, linkedin_summary=None):
+    article, complete = invoke_claude_continued(f'The topic is: "{topic}".', HASHNODE_CHUNK_TOKENS, HASHNODE_TOKEN_BUDGET,
+                                                system=HASHNODE_SYSTEM_PROMPT, partial_path=partial_path(topic, "hashnode"),
+                                                stage="hashnode")
+    if not complete:
+        print(f"⚠️ Article for '{topic}' still truncated after {HASHNODE_TOKEN_BUDGET} tokens")
+    return article, complete
+
+def create_review_issue(topic, linkedin_content, hashnode_content, complete=True):
+    url = f"{GITHUB_API}/repos/{os.environ['GITHUB_REPOSITORY']}/issues"
     
+    correlation_id = os.environ.get("CORRELATION_ID", "").strip()
+    marker = f"{correlation_marker(correlation_id)}\n" if correlation_id else ""
+    # Truncated articles stay out of the approval queue until someone finishes them and relabels the issue.
+    warning = "" if complete else "⚠️ The article hit the token budget before finishing. Complete it and swap the `incomplete` label for `draft`.\n"
     body = f"""🤖 Draft generated for topic: {topic}
-
+{marker}{warning}
 ---HASHNODE_ARTICLE---
 {hashnode_content}
 ---LINKEDIN_POST---
 {linkedin_content}
 ---END---
 """
-    issue = repo.create_issue(title=f"Draft: {topic}", body=body, labels=["draft"])
-    return issue
+    resp = http_client.post(url, headers=github_headers(os.environ["GITHUB_TOKEN"]),
+                            json={"title": f"Draft: {topic}", "body": body, "labels": ["draft" if complete else "incomplete"]})
+    if resp.status_code != 201:
+        raise Exception(f"GitHub Error: {resp.text}")
+    return resp.json()
 
-def send_notification_email(issue_url, topic):
+def send_notification_email(issue_url, topic, complete=True):
     sender = os.environ["EMAIL_USER"]
     password = os.environ["EMAIL_PASS"]
     receiver = os.environ["EMAIL_RECEIVER"]
     
-    msg = MIMEText(f"New Draft Ready: {topic}\n\nReview here: {issue_url}")
-    msg['Subject'] = f"🚀 Review: {topic}"
+    status = "New Draft Ready" if complete else "Incomplete Draft (article was truncated)"
+    msg = MIMEText(f"{status}: {topic}\n\nReview here: {issue_url}")
+    msg['Subject'] = f"🚀 Review: {topic}" if complete else f"⚠️ Incomplete: {topic}"
     msg['From'] = sender
     msg['To'] = receiver
     
@@ -137,20 +156,109 @@ def send_notification_email(issue_url, topic):
         server.login(sender, password)
         server.send_message(msg)
 
+def timed(stage, fn, *args, **kwargs):
+    with metrics.stage(stage):
+        return fn(*args, **kwargs)
+
+def next_topic(pool, history, index):
+    # Queued topics are rechecked on the way out: history may have caught up with them since they were queued.
+    while True:
+        if not len(pool) and not refill(pool, [h['topic'] for h in history]):
+            print("⚠️ Topic pool refill came back empty, asking for a single topic")
+            return get_unique_topic(history, index)
+        topic = pool.pop()
+        nearest = index.nearest(topic, k=1)
+        if not nearest or nearest[0][1] < SIMILARITY_THRESHOLD:
+            return topic
+        print(f"♻️ Skipped queued '{topic}' ({nearest[0][1]:.2f} similar to '{nearest[0][0]}')")
+        pool.consume(topic)
+
+def pick_topics(history, count, pool=None):
+    # Topic picks stay sequential so each one sees the picks before it.
+    pool = pool if pool is not None else TopicPool()
+    history = list(history)
+    index = TopicIndex.load([h['topic'] for h in history])
+    topics = []
+    for _ in range(count):
+        topic = timed("topic", next_topic, pool, history, index)
+        topics.append(topic)
+        history.append({"topic": topic})
+        index.add(topic)
+    return topics
+
+def top_up_pool(pool, known_topics):
+    # Runs once the drafts are out, so the next scheduled run can start drafting straight from the pool.
+    if len(pool) >= MIN_SIZE:
+        return 0
+    try:
+        return timed("topic_refill", refill, pool, known_topics)
+    except Exception as e:
+        print(f"⚠️ Could not refill the topic pool: {e}")
+        return 0
+
+def draft_topic(topic, pool=None):
+    # The article prompt doesn't use the LinkedIn post, so both calls run side by side.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        li_future = executor.submit(timed, "linkedin", generate_linkedin_post, topic)
+        hn_future = executor.submit(timed, "hashnode", generate_hashnode_article, topic)
+        linkedin_content = li_future.result()
+        hashnode_content, complete = hn_future.result()
+
+    issue = timed("issue", create_review_issue, topic, linkedin_content, hashnode_content, complete)
+    if pool is not None:
+        pool.consume(topic)
+    timed("email", send_notification_email, issue["html_url"], topic, complete)
+    return issue
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Draft LinkedIn posts and Hashnode articles.")
+    parser.add_argument("--count", type=int, default=int(os.environ.get("DRAFT_COUNT") or 1),
+                        help="Number of drafts to create in this run")
+    parser.add_argument("--concurrency", type=int, default=int(os.environ.get("DRAFT_CONCURRENCY") or 3),
+                        help="Maximum drafts generated at the same time")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Skip cached Bedrock responses and ask for fresh output")
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    args = parse_args()
+    if args.no_cache:
+        os.environ["LLM_CACHE_BYPASS"] = "1"
     print("🚀 Starting Agent...")
-    history = load_topic_history()
-    
+    start = time.perf_counter()
+    with startup_profile.step("load topic history"):
+        history = load_topic_history()
+
+    topic_pool = TopicPool()
     custom_topic = os.environ.get("CUSTOM_TOPIC", "").strip()
-    topic = custom_topic if custom_topic else get_unique_topic(history)
-    
-    print("✍️ Generating LinkedIn Draft...")
-    linkedin_content = generate_linkedin_post(topic)
-    
-    print("📝 Generating Hashnode Article...")
-    hashnode_content = generate_hashnode_article(topic, linkedin_content)
-    
-    print("📦 Creating GitHub Issue...")
-    issue = create_review_issue(topic, linkedin_content, hashnode_content)
-    send_notification_email(issue.html_url, topic)
+    if custom_topic:
+        topics = [custom_topic] + pick_topics(history + [{"topic": custom_topic}], args.count - 1, topic_pool)
+    else:
+        topics = pick_topics(history, args.count, topic_pool)
+    startup_profile.report("startup through topic selection")
+
+    print(f"✍️ Drafting {len(topics)} post(s) with concurrency {args.concurrency}...")
+    failures = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as executor:
+        # Queued topics only leave the pool once their issue exists; a failed draft keeps its topic for the next run.
+        futures = {executor.submit(draft_topic, topic, topic_pool): topic for topic in topics}
+        for future, topic in futures.items():
+            try:
+                issue = future.result()
+                print(f"📦 Created {issue['html_url']} for: {topic}")
+            except Exception as e:
+                failures += 1
+                print(f"❌ Failed to draft '{topic}': {e}")
+
+    if not custom_topic or args.count > 1:
+        # A Generate-tab run for a single custom topic never draws from the pool, so it leaves the top-up to the schedule.
+        top_up_pool(topic_pool, [h['topic'] for h in history] + topics)
+
+    print(f"⏱️ total: {time.perf_counter() - start:.1f}s")
+    stats = response_cache.stats()
+    print(f"🗄️ Response cache: {stats['hits']} hits, {stats['misses']} misses")
+    for name, s in http_client.latency_stats().items():
+        print(f"🌐 {name}: {s['count']} calls, p50 {s['p50']:.2f}s, max {s['max']:.2f}s")
+    if failures:
+        raise SystemExit(1)
     print("✅ Done!")
@@ -0,0 +1,91 @@
+import time
+import threading
+import http_client
+
+DEFAULT_TTL = 30
+
+class GitHubReadCache:
+    def __init__(self, headers, ttl=DEFAULT_TTL):
+        self.headers = headers
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.skipped = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, url, parse=lambda resp: resp.json(), max_age=None, headers=None):
+        max_age = self.ttl if max_age is None else max_age
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry and time.time() - entry["fetched_at"] < max_age:
+            with self._lock:
+                self.hits += 1
+                self.skipped += 1
+            return 200, entry["data"]
+
+        headers = {**self.headers, **(headers or {})}
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        resp = http_client.get(url, headers=headers)
+        # GitHub doesn't count 304s against the rate limit, and the parsed object is reused as-is.
+        if resp.status_code == 304 and entry:
+            with self._lock:
+                entry["fetched_at"] = time.time()
+                self.hits += 1
+                self.revalidated += 1
+            return 200, entry["data"]
+
+        with self._lock:
+            self.misses += 1
+        if resp.status_code != 200:
+            self.invalidate(url)
+            return resp.status_code, None
+
+        data = parse(resp)
+        with self._lock:
+            self._entries[url] = {
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+                "data": data,
+                "fetched_at": time.time()
+            }
+        return 200, data
+
+    def memo(self, key, loader, max_age=None):
+        # TTL-only caching for reads that can't be made conditional, such as GraphQL queries.
+        max_age = self.ttl if max_age is None else max_age
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and time.time() - entry["fetched_at"] < max_age:
+            with self._lock:
+                self.hits += 1
+                self.skipped += 1
+            return entry["data"]
+
+        data = loader()
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = {"etag": None, "last_modified": None, "data": data, "fetched_at": time.time()}
+        return data
+
+    def invalidate(self, prefix=""):
+        with self._lock:
+            for url in [u for u in self._entries if u.startswith(prefix)]:
+                del self._entries[url]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            # Requests never sent because the TTL hadn't expired.
+            "saved_requests": self.skipped,
+            # Requests answered with a bodiless 304, which GitHub doesn't charge to the rate limit.
+            "not_modified": self.revalidated
+        }
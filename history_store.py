@@ -0,0 +1,110 @@
+import os
+import sys
+import json
+import zlib
+import bisect
+from datetime import datetime
+
+HISTORY_FILE = "topic_history.jsonl"
+LEGACY_HISTORY_FILE = "topic_history.json"
+
+def normalize_topic(topic):
+    return " ".join(topic.lower().split())
+
+def migrate_json(json_path=LEGACY_HISTORY_FILE, jsonl_path=HISTORY_FILE):
+    with open(json_path, "r") as f:
+        history = json.load(f)
+    with open(jsonl_path, "w") as f:
+        for entry in history:
+            f.write(json.dumps({"date": entry["date"], "topic": entry["topic"]}) + "\n")
+    return len(history)
+
+class HistoryStore:
+    def __init__(self, path=HISTORY_FILE):
+        self.path = path
+        self._reset()
+        if path and not os.path.exists(path) and os.path.exists(LEGACY_HISTORY_FILE):
+            print(f"📦 Migrating {LEGACY_HISTORY_FILE} to {path}...")
+            migrate_json(LEGACY_HISTORY_FILE, path)
+        if path:
+            self.refresh()
+
+    def _reset(self):
+        self.entries = []
+        self.offset = 0
+        self._crc = 0
+        self._dates = []  # sorted (date, position) pairs
+        self._by_topic = {}
+
+    def _consume(self, data):
+        # Only whole lines are consumed; a half-written trailing line waits for the next read.
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if line.strip():
+                self._index(json.loads(line))
+        self._crc = zlib.crc32(data[:end], self._crc)
+        self.offset += end
+        return end
+
+    def _index(self, entry):
+        position = len(self.entries)
+        self.entries.append(entry)
+        bisect.insort(self._dates, (entry["date"], position))
+        self._by_topic[normalize_topic(entry["topic"])] = position
+
+    def refresh(self):
+        if not os.path.exists(self.path):
+            self._reset()
+            return []
+        if os.path.getsize(self.path) < self.offset:
+            self._reset()
+        start = len(self.entries)
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            self._consume(f.read())
+        return self.entries[start:]
+
+    def feed(self, data):
+        # For callers that receive the whole file (e.g. from the GitHub API): only the unseen tail is parsed.
+        if len(data) < self.offset or zlib.crc32(data[:self.offset]) != self._crc:
+            self._reset()
+        start = len(self.entries)
+        self._consume(data[self.offset:])
+        return self.entries[start:]
+
+    def append(self, topic, date=None):
+        entry = {"date": date or str(datetime.now().date()), "topic": topic}
+        line = (json.dumps(entry) + "\n").encode()
+        with open(self.path, "ab") as f:
+            f.write(line)
+        self._index(entry)
+        self._crc = zlib.crc32(line, self._crc)
+        self.offset += len(line)
+        return entry
+
+    def has_topic(self, topic):
+        return normalize_topic(topic) in self._by_topic
+
+    def topics(self):
+        return [e["topic"] for e in self.entries]
+
+    def query(self, start=None, end=None, page=1, per_page=50, newest_first=True):
+        lo = bisect.bisect_left(self._dates, (start,)) if start else 0
+        hi = bisect.bisect_right(self._dates, (end, float("inf"))) if end else len(self._dates)
+        total = max(0, hi - lo)
+        offset = (page - 1) * per_page
+        if newest_first:
+            window = self._dates[max(lo, hi - offset - per_page):max(lo, hi - offset)][::-1]
+        else:
+            window = self._dates[min(hi, lo + offset):min(hi, lo + offset + per_page)]
+        return [self.entries[pos] for _, pos in window], total
+
+    def __len__(self):
+        return len(self.entries)
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["migrate"]:
+        count = migrate_json()
+        print(f"✅ Migrated {count} entries from {LEGACY_HISTORY_FILE} to {HISTORY_FILE}")
+    else:
+        print("Usage: python history_store.py migrate")
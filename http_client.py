@@ -0,0 +1,139 @@
+import os
+import re
+import time
+import random
+import threading
+from collections import defaultdict
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+GITHUB_API = os.environ.get("GITHUB_API_URL", "https://api.github.com")
+
+TIMEOUT = (float(os.environ.get("HTTP_CONNECT_TIMEOUT") or 5), float(os.environ.get("HTTP_READ_TIMEOUT") or 30))
+MAX_RETRIES = int(os.environ.get("HTTP_MAX_RETRIES") or 4)
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+# Longer rate-limit waits than this are surfaced to the caller instead of slept through.
+MAX_WAIT = 120.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "PATCH", "DELETE"}
+
+session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+session.mount("https://", _adapter)
+session.mount("http://", _adapter)
+
+_latencies = defaultdict(list)
+_lock = threading.Lock()
+_local = threading.local()
+
+def github_headers(token):
+    return {"Authorization": f"token {token}", "Accept": "application/vnd.github.v3+json"}
+
+def endpoint_name(method, url):
+    parts = urlsplit(url)
+    path = re.sub(r"/\d+(?=/|$)", "/:id", parts.path)
+    return f"{method} {parts.netloc}{path}"
+
+def record_latency(method, url, seconds):
+    with _lock:
+        _latencies[endpoint_name(method, url)].append(seconds)
+
+def round_trips():
+    # Requests sent from the current thread, retries included.
+    return getattr(_local, "round_trips", 0)
+
+def retry_count():
+    return getattr(_local, "retries", 0)
+
+def latency_stats():
+    with _lock:
+        snapshot = {name: sorted(values) for name, values in _latencies.items()}
+    return {
+        name: {
+            "count": len(values),
+            "p50": values[len(values) // 2],
+            "p95": values[min(len(values) - 1, int(len(values) * 0.95))],
+            "max": values[-1]
+        }
+        for name, values in snapshot.items()
+    }
+
+def is_rate_limited(resp):
+    if resp.status_code == 429:
+        return True
+    if resp.status_code == 403:
+        return resp.headers.get("X-RateLimit-Remaining") == "0" or "rate limit" in resp.text.lower()
+    return False
+
+def retry_delay(resp, attempt):
+    if resp is not None:
+        retry_after = resp.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+        reset = resp.headers.get("X-RateLimit-Reset")
+        if reset and resp.headers.get("X-RateLimit-Remaining") == "0":
+            return max(0.0, float(reset) - time.time()) + 1
+    # Jittered exponential backoff so parallel workers don't retry in lockstep.
+    return min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+def request(method, url, retries=MAX_RETRIES, timeout=TIMEOUT, idempotent=None, **kwargs):
+    method = method.upper()
+    if idempotent is None:
+        idempotent = method in IDEMPOTENT_METHODS
+
+    for attempt in range(retries + 1):
+        _local.round_trips = round_trips() + 1
+        _local.retries = retry_count() + (1 if attempt else 0)
+        start = time.perf_counter()
+        try:
+            resp = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            record_latency(method, url, time.perf_counter() - start)
+            # A non-idempotent request may have landed if the failure came after connecting.
+            if attempt == retries or not (idempotent or isinstance(e, requests.ConnectTimeout)):
+                raise
+            delay = retry_delay(None, attempt)
+            print(f"🔁 {method} {url} failed ({e.__class__.__name__}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+
+        record_latency(method, url, time.perf_counter() - start)
+        retryable = is_rate_limited(resp) or (idempotent and resp.status_code in RETRY_STATUSES)
+        if not retryable or attempt == retries:
+            return resp
+
+        delay = retry_delay(resp, attempt)
+        if delay > MAX_WAIT:
+            return resp
+        print(f"🔁 {method} {url} returned {resp.status_code}, retrying in {delay:.1f}s")
+        time.sleep(delay)
+
+def paginate(url, **kwargs):
+    # Follows GitHub-style Link: rel="next" headers until the last page.
+    while url:
+        resp = get(url, **kwargs)
+        if resp.status_code != 200:
+            raise Exception(f"HTTP {resp.status_code} from {url}: {resp.text}")
+        yield from resp.json()
+        url = resp.links.get("next", {}).get("url")
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+def post(url, **kwargs):
+    return request("POST", url, **kwargs)
+
+def patch(url, **kwargs):
+    return request("PATCH", url, **kwargs)
+
+def put(url, **kwargs):
+    return request("PUT", url, **kwargs)
+
+def delete(url, **kwargs):
+    return request("DELETE", url, **kwargs)
@@ -0,0 +1,113 @@
+import os
+import time
+from contextlib import contextmanager
+import http_client
+from http_client import GITHUB_API
+
+GRAPHQL_URL = os.environ.get("GITHUB_GRAPHQL_URL", f"{GITHUB_API}/graphql")
+
+class IssueOps:
+    def __init__(self, owner, repo, headers):
+        self.owner = owner
+        self.repo = repo
+        self.headers = headers
+        self._label_ids = {}
+
+    def graphql(self, query, variables=None, idempotent=False):
+        resp = http_client.post(GRAPHQL_URL, headers=self.headers, json={"query": query, "variables": variables or {}},
+                                idempotent=idempotent)
+        data = resp.json() if resp.headers.get("Content-Type", "").startswith("application/json") else {}
+        if resp.status_code != 200 or data.get("errors"):
+            raise Exception(f"GitHub GraphQL Error: {data.get('errors') or resp.text}")
+        return data["data"]
+
+    def list_issues(self, labels, page_size=100):
+        # Titles and metadata only, following every page; bodies are fetched per issue when opened.
+        query = """
+        query($owner: String!, $repo: String!, $labels: [String!], $first: Int!, $after: String) {
+          repository(owner: $owner, name: $repo) {
+            issues(first: $first, after: $after, labels: $labels, states: OPEN, orderBy: {field: CREATED_AT, direction: DESC}) {
+              nodes { id number title updatedAt url }
+              pageInfo { hasNextPage endCursor }
+            }
+          }
+        }
+        """
+        issues = []
+        after = None
+        while True:
+            variables = {"owner": self.owner, "repo": self.repo, "labels": labels, "first": page_size, "after": after}
+            page = self.graphql(query, variables, idempotent=True)["repository"]["issues"]
+            issues += [
+                {"node_id": n["id"], "number": n["number"], "title": n["title"], "updated_at": n["updatedAt"], "html_url": n["url"]}
+                for n in page["nodes"]
+            ]
+            if not page["pageInfo"]["hasNextPage"]:
+                return issues
+            after = page["pageInfo"]["endCursor"]
+
+    def label_ids(self, names, create=False):
+        # Labels the repo doesn't have are left out, or created first with create=True.
+        missing = [n for n in names if n not in self._label_ids]
+        if missing:
+            fields = " ".join(f'l{i}: label(name: "{n}") {{ id }}' for i, n in enumerate(missing))
+            data = self.graphql(f'query($owner: String!, $repo: String!) {{ repository(owner: $owner, name: $repo) {{ {fields} }} }}',
+                                {"owner": self.owner, "repo": self.repo}, idempotent=True)["repository"]
+            for i, name in enumerate(missing):
+                if data[f"l{i}"]:
+                    self._label_ids[name] = data[f"l{i}"]["id"]
+                elif create:
+                    self._label_ids[name] = self.create_label(name)
+        return [self._label_ids[n] for n in names if n in self._label_ids]
+
+    def create_label(self, name):
+        # GraphQL can only attach existing labels; the REST endpoint creates one, as the old issue labels POST did.
+        resp = http_client.post(f"{GITHUB_API}/repos/{self.owner}/{self.repo}/labels", headers=self.headers, json={"name": name})
+        if resp.status_code == 201:
+            return resp.json()["node_id"]
+        if resp.status_code == 422:  # created by another client since the lookup
+            existing = self.label_ids([name])
+            if existing:
+                return existing[0]
+        raise Exception(f"GitHub Error: could not create label '{name}': {resp.text}")
+
+    def transition(self, node_id, body=None, add_labels=(), remove_labels=(), comments=(), close=False):
+        # Every requested change goes out as one aliased mutation document, i.e. one round trip.
+        params = ["$id: ID!"]
+        fields = []
+        variables = {"id": node_id}
+        if body is not None:
+            params.append("$body: String!")
+            fields.append("update: updateIssue(input: {id: $id, body: $body}) { clientMutationId }")
+            variables["body"] = body
+        if add_labels:
+            params.append("$add: [ID!]!")
+            fields.append("label: addLabelsToLabelable(input: {labelableId: $id, labelIds: $add}) { clientMutationId }")
+            variables["add"] = self.label_ids(add_labels, create=True)
+        remove = self.label_ids(remove_labels) if remove_labels else []
+        if remove:
+            params.append("$remove: [ID!]!")
+            fields.append("unlabel: removeLabelsFromLabelable(input: {labelableId: $id, labelIds: $remove}) { clientMutationId }")
+            variables["remove"] = remove
+        for i, comment in enumerate(comments):
+            params.append(f"$c{i}: String!")
+            fields.append(f"c{i}: addComment(input: {{subjectId: $id, body: $c{i}}}) {{ clientMutationId }}")
+            variables[f"c{i}"] = comment
+        if close:
+            fields.append("close: closeIssue(input: {issueId: $id}) { clientMutationId }")
+        if not fields:
+            return None
+        return self.graphql(f"mutation({', '.join(params)}) {{ {' '.join(fields)} }}", variables)
+
+    @contextmanager
+    def action(self, name):
+        # IssueOps is shared by every dashboard session, so the report goes back to the caller instead of onto self.
+        report = {"action": name, "round_trips": 0, "seconds": 0.0}
+        trips = http_client.round_trips()
+        start = time.perf_counter()
+        try:
+            yield report
+        finally:
+            report["round_trips"] = http_client.round_trips() - trips
+            report["seconds"] = time.perf_counter() - start
+            print(f"⚡ {name}: {report['round_trips']} round trip(s) in {report['seconds']:.2f}s")
@@ -0,0 +1,104 @@
+import time
+import uuid
+from datetime import datetime, timezone, timedelta
+import http_client
+
+WORKFLOW_FILE = "daily_draft.yml"
+FIRST_POLL = 3.0
+MAX_POLL = 30.0
+TIMEOUT = 15 * 60
+
+def correlation_marker(correlation_id):
+    return f"<!-- correlation-id: {correlation_id} -->"
+
+def new_job(topic):
+    now = time.time()
+    return {
+        "id": uuid.uuid4().hex[:12],
+        "topic": topic,
+        "status": "dispatching",
+        "conclusion": None,
+        "run_id": None,
+        "run_url": None,
+        "issue_url": None,
+        "started": now,
+        "finished": None,
+        "next_poll": now,
+        "interval": FIRST_POLL
+    }
+
+def is_active(job):
+    return job["status"] not in ("completed", "failed")
+
+def elapsed(job):
+    # Frozen once the job finishes, so a completed run keeps showing how long it took.
+    return (job.get("finished") or time.time()) - job["started"]
+
+def _finish(job, status, conclusion=None):
+    job["status"] = status
+    if conclusion is not None:
+        job["conclusion"] = conclusion
+    job["finished"] = time.time()
+
+def dispatch(repo_url, headers, job, ref="main"):
+    resp = http_client.post(
+        f"{repo_url}/actions/workflows/{WORKFLOW_FILE}/dispatches",
+        headers=headers,
+        json={"ref": ref, "inputs": {"custom_topic": job["topic"], "correlation_id": job["id"]}}
+    )
+    if resp.status_code != 204:
+        _finish(job, "failed", f"dispatch error {resp.status_code}")
+    else:
+        job["status"] = "queued"
+    return job
+
+def _backoff(job):
+    job["interval"] = min(MAX_POLL, job["interval"] * 1.5)
+    job["next_poll"] = time.time() + job["interval"]
+
+def _find_run(repo_url, gh_cache, job):
+    # The run-name carries the correlation id, which tells our run apart from scheduled ones.
+    created = (datetime.fromtimestamp(job["started"], timezone.utc) - timedelta(minutes=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    url = f"{repo_url}/actions/workflows/{WORKFLOW_FILE}/runs?event=workflow_dispatch&created=>={created}"
+    status, data = gh_cache.get(url, max_age=0)
+    if status != 200:
+        return None
+    return next((r for r in data["workflow_runs"] if job["id"] in (r.get("display_title") or "")), None)
+
+def _find_issue(repo_url, gh_cache, job):
+    since = datetime.fromtimestamp(job["started"], timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    status, issues = gh_cache.get(f"{repo_url}/issues?state=all&since={since}&per_page=100", max_age=0)
+    if status != 200:
+        return None
+    marker = correlation_marker(job["id"])
+    return next((i for i in issues if marker in (i.get("body") or "")), None)
+
+def poll(repo_url, gh_cache, job):
+    if not is_active(job) or time.time() < job["next_poll"]:
+        return job
+
+    if time.time() - job["started"] > TIMEOUT:
+        _finish(job, "failed", "timed out")
+        return job
+
+    if job["run_id"] is None:
+        run = _find_run(repo_url, gh_cache, job)
+    else:
+        status, run = gh_cache.get(f"{repo_url}/actions/runs/{job['run_id']}", max_age=0)
+        run = run if status == 200 else None
+
+    if run:
+        job["run_id"] = run["id"]
+        job["run_url"] = run["html_url"]
+        job["status"] = run["status"]
+        job["conclusion"] = run["conclusion"]
+
+    if job["status"] == "completed":
+        _finish(job, "completed" if job["conclusion"] == "success" else "failed")
+        if job["status"] == "completed":
+            issue = _find_issue(repo_url, gh_cache, job)
+            job["issue_url"] = issue["html_url"] if issue else None
+        return job
+
+    _backoff(job)
+    return job
@@ -0,0 +1,184 @@
+import os
+import json
+import threading
+from botocore.exceptions import ClientError
+from response_cache import response_cache
+import metrics
+import model_router
+import startup_profile
+
+MODEL_ID = model_router.STRONG_MODEL
+AWS_REGION = "us-east-1"
+
+_client = None
+_client_lock = threading.Lock()
+
+def create_client(aws_access_key_id=None, aws_secret_access_key=None):
+    # boto3 takes a few hundred ms to import, so it only loads once a client is actually needed.
+    with startup_profile.step("create Bedrock client"):
+        import boto3
+        return boto3.client(
+            service_name='bedrock-runtime',
+            region_name=AWS_REGION,
+            aws_access_key_id=aws_access_key_id,
+            aws_secret_access_key=aws_secret_access_key
+        )
+
+def get_bedrock():
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = create_client(os.environ.get('AWS_ACCESS_KEY_ID'), os.environ.get('AWS_SECRET_ACCESS_KEY'))
+        return _client
+
+def set_client(client):
+    # Swaps the Bedrock runtime client for every call that doesn't pass its own, e.g. a stub in benchmarks.
+    global _client
+    with _client_lock:
+        _client = client
+
+def build_payload(prompt, max_tokens, temperature, prefill=None, system=None):
+    messages = [{"role": "user", "content": [{"type": "text", "text": prompt}]}]
+    if prefill:
+        # Claude carries on from a trailing assistant turn, which is how truncated output is resumed. Each earlier
+        # chunk is its own block so the next continuation can hit the cache at the previous chunk's boundary.
+        parts = [prefill] if isinstance(prefill, str) else list(prefill)
+        content = [{"type": "text", "text": part} for part in parts]
+        content[-1]["cache_control"] = {"type": "ephemeral"}
+        messages.append({"role": "assistant", "content": content})
+    payload = {
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        "messages": messages
+    }
+    if system:
+        # Static instructions go first so Bedrock can reuse their processed prefix across topics and runs.
+        payload["system"] = [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+    return payload
+
+def cache_input(payload):
+    return [payload["system"], payload["messages"]] if "system" in payload else payload["messages"]
+
+def cache_bypassed():
+    return os.environ.get("LLM_CACHE_BYPASS", "").lower() in ("1", "true", "yes")
+
+def call_with_fallback(method, models, payload, client=None):
+    # Tries each model in turn, moving on only for errors another model might not hit (throttling, outages).
+    client = client or get_bedrock()
+    for i, model_id in enumerate(models):
+        try:
+            return model_id, getattr(client, method)(modelId=model_id, body=json.dumps(payload))
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if i == len(models) - 1 or code not in model_router.FALLBACK_ERRORS:
+                print(f"AWS Error: {e}")
+                raise
+            print(f"🔀 {model_id} failed ({code}), falling back to {models[i + 1]}")
+            metrics.add_fallback()
+
+def invoke_claude_full(prompt, max_tokens=2000, temperature=0.7, model_id=MODEL_ID, client=None, partial_path=None,
+                       cache=None, use_cache=True, prefill=None, stage=None, system=None):
+    # With a stage, the model comes from model_router and falls back to the next tier on failure.
+    if partial_path:
+        meta = {}
+        text = "".join(stream_claude(prompt, max_tokens, temperature, model_id, client=client, partial_path=partial_path,
+                                     cache=cache, use_cache=use_cache, prefill=prefill, meta=meta, stage=stage,
+                                     system=system))
+        return {"text": text, "stop_reason": meta.get("stop_reason"), "usage": meta.get("usage", {}), "model_id": meta.get("model_id")}
+
+    models = model_router.models_for(stage) if stage else [model_id]
+    cache = cache or response_cache
+    payload = build_payload(prompt, max_tokens, temperature, prefill, system)
+    # Keyed on the primary model even when a fallback answered; the entry records which model that was.
+    key = cache.key(models[0], cache_input(payload), max_tokens, temperature)
+    if use_cache and not cache_bypassed():
+        cached = cache.get(key)
+        if cached is not None:
+            return {"text": cached["text"], "stop_reason": cached.get("stop_reason"), "usage": {},
+                    "model_id": cached.get("model_id") or models[0]}
+
+    model_id, response = call_with_fallback("invoke_model", models, payload, client)
+    result = json.loads(response['body'].read())
+    text = result['content'][0]['text'] if result['content'] else ""
+
+    metrics.add_usage(model_id, result.get('usage', {}), response['ResponseMetadata'].get('RetryAttempts', 0))
+
+    cache.put(key, text, model_id, result.get('stop_reason'))
+    return {"text": text, "stop_reason": result.get('stop_reason'), "usage": result.get('usage', {}), "model_id": model_id}
+
+def invoke_claude(prompt, max_tokens=2000, **kwargs):
+    return invoke_claude_full(prompt, max_tokens, **kwargs)["text"]
+
+def invoke_claude_continued(prompt, chunk_tokens=4000, total_budget=16000, **kwargs):
+    # Generates in chunks of at most chunk_tokens, resuming after each max_tokens stop until the
+    # model finishes on its own or total_budget output tokens are spent. Returns (text, complete).
+    parts = []
+    spent = 0
+    while True:
+        budget = min(chunk_tokens, total_budget - spent)
+        result = invoke_claude_full(prompt, budget, prefill=parts or None, **kwargs)
+        spent += result["usage"].get("output_tokens", budget)
+        if result["stop_reason"] != "max_tokens":
+            return "".join(parts) + result["text"], True
+        # An assistant turn can't end in whitespace; the model re-emits it when it carries on.
+        parts.append(result["text"].rstrip())
+        if spent >= total_budget:
+            return "".join(parts), False
+        print(f"✂️ Hit max_tokens after {spent} tokens, continuing...")
+
+def iter_stream_text(event_stream, meta=None):
+    # Bedrock wraps each Anthropic streaming event in {"chunk": {"bytes": b"..."}}.
+    meta = meta if meta is not None else {}
+    meta.setdefault("usage", {})
+    for event in event_stream:
+        chunk = event.get("chunk")
+        if not chunk:
+            continue
+        data = json.loads(chunk["bytes"])
+        if data.get("type") == "message_start":
+            meta["usage"].update(data["message"].get("usage", {}))
+        elif data.get("type") == "message_delta":
+            meta["usage"].update(data.get("usage", {}))
+            meta["stop_reason"] = data["delta"].get("stop_reason")
+        elif data.get("type") == "content_block_delta" and data["delta"].get("type") == "text_delta":
+            yield data["delta"]["text"]
+
+def stream_claude(prompt, max_tokens=2000, temperature=0.7, model_id=MODEL_ID, client=None, partial_path=None,
+                  cache=None, use_cache=True, prefill=None, meta=None, stage=None, system=None):
+    meta = meta if meta is not None else {}
+    models = model_router.models_for(stage) if stage else [model_id]
+    cache = cache or response_cache
+    payload = build_payload(prompt, max_tokens, temperature, prefill, system)
+    key = cache.key(models[0], cache_input(payload), max_tokens, temperature)
+    if use_cache and not cache_bypassed():
+        cached = cache.get(key)
+        if cached is not None:
+            meta["stop_reason"] = cached.get("stop_reason")
+            meta["usage"] = {}
+            meta["model_id"] = cached.get("model_id") or models[0]
+            yield cached["text"]
+            return
+
+    # Fallback only covers starting the stream; once text has been yielded it can't be taken back.
+    model_id, response = call_with_fallback("invoke_model_with_response_stream", models, payload, client)
+    meta["model_id"] = model_id
+
+    parts = []
+    if not partial_path:
+        for text in iter_stream_text(response['body'], meta):
+            parts.append(text)
+            yield text
+    else:
+        # Flush every chunk so a timeout or crash still leaves what was generated on disk.
+        os.makedirs(os.path.dirname(partial_path) or ".", exist_ok=True)
+        with open(partial_path, "w") as f:
+            f.write("".join([prefill] if isinstance(prefill, str) else prefill or []))
+            for text in iter_stream_text(response['body'], meta):
+                f.write(text)
+                f.flush()
+                parts.append(text)
+                yield text
+
+    metrics.add_usage(model_id, meta["usage"], response['ResponseMetadata'].get('RetryAttempts', 0))
+    cache.put(key, "".join(parts), model_id, meta.get("stop_reason"))
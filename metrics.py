@@ -0,0 +1,79 @@
+import os
+import json
+import time
+import threading
+from datetime import datetime, timezone
+from contextlib import contextmanager
+import http_client
+import model_router
+
+METRICS_FILE = os.environ.get("METRICS_FILE", "metrics.jsonl")
+
+_local = threading.local()
+_write_lock = threading.Lock()
+
+def current():
+    return getattr(_local, "record", None)
+
+def add_usage(model_id, usage, retries=0):
+    # Called by the LLM layer; attributes tokens to whichever stage is running on this thread.
+    record = current()
+    if record is None:
+        return
+    record["model_id"] = model_id
+    record["input_tokens"] += usage.get("input_tokens", 0)
+    record["output_tokens"] += usage.get("output_tokens", 0)
+    record["cache_read_input_tokens"] += usage.get("cache_read_input_tokens") or 0
+    record["cache_creation_input_tokens"] += usage.get("cache_creation_input_tokens") or 0
+    record["retries"] += retries
+    record["cost_usd"] = round(record["cost_usd"] + model_router.cost(model_id, usage), 6)
+
+def add_fallback():
+    record = current()
+    if record is not None:
+        record["fallbacks"] += 1
+
+def write(record, path=METRICS_FILE):
+    with _write_lock:
+        with open(path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+@contextmanager
+def stage(name, **fields):
+    record = {
+        "ts": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "stage": name,
+        "wall_time": 0.0,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "cache_read_input_tokens": 0,
+        "cache_creation_input_tokens": 0,
+        "model_id": None,
+        "retries": 0,
+        "fallbacks": 0,
+        "cost_usd": 0.0,
+        "outcome": "ok",
+        "run_id": os.environ.get("GITHUB_RUN_ID"),
+        **fields
+    }
+    parent = current()
+    _local.record = record
+    http_retries = http_client.retry_count()
+    start = time.perf_counter()
+    try:
+        yield record
+    except Exception as e:
+        record["outcome"] = f"error: {e.__class__.__name__}"
+        raise
+    finally:
+        record["wall_time"] = round(time.perf_counter() - start, 3)
+        record["retries"] += http_client.retry_count() - http_retries
+        _local.record = parent
+        cached = f", cache {record['cache_read_input_tokens']} read/{record['cache_creation_input_tokens']} written" \
+            if record['cache_read_input_tokens'] or record['cache_creation_input_tokens'] else ""
+        print(f"⏱️ {name}: {record['wall_time']:.1f}s, {record['input_tokens']}→{record['output_tokens']} tokens{cached}, "
+              f"${record['cost_usd']:.4f} ({record['outcome']})")
+        write(record)
+
+def parse(data):
+    return [json.loads(line) for line in data.splitlines() if line.strip()]
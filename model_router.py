@@ -0,0 +1,64 @@
+import os
+
+FAST_MODEL = "us.anthropic.claude-haiku-4-5-20251001-v1:0"
+BALANCED_MODEL = "us.anthropic.claude-sonnet-4-5-20250929-v1:0"
+STRONG_MODEL = "us.anthropic.claude-opus-4-5-20251101-v1:0"
+
+TIERS = {
+    "fast": os.environ.get("MODEL_FAST") or FAST_MODEL,
+    "balanced": os.environ.get("MODEL_BALANCED") or BALANCED_MODEL,
+    "strong": os.environ.get("MODEL_STRONG") or STRONG_MODEL
+}
+
+# Short outputs go to the fast tier; only the long-form article needs the strong one.
+STAGE_TIERS = {
+    "topic": "fast",
+    "brainstorm": "fast",
+    "linkedin": "balanced",
+    "hashnode": "strong"
+}
+DEFAULT_TIER = "strong"
+FALLBACK_TIERS = {
+    "fast": ["balanced"],
+    "balanced": ["strong"],
+    "strong": ["balanced"]
+}
+# Bedrock error codes worth retrying on another model; anything else (e.g. a bad request) would fail there too.
+FALLBACK_ERRORS = {
+    "ThrottlingException", "ServiceUnavailableException", "ModelNotReadyException", "ModelTimeoutException",
+    "InternalServerException", "ModelErrorException", "AccessDeniedException", "ResourceNotFoundException"
+}
+
+# USD per million input / output tokens. Cache writes cost 1.25x the input price and cache reads 0.1x.
+PRICES = {
+    FAST_MODEL: (1.0, 5.0),
+    BALANCED_MODEL: (3.0, 15.0),
+    STRONG_MODEL: (5.0, 25.0)
+}
+CACHE_WRITE_FACTOR = 1.25
+CACHE_READ_FACTOR = 0.1
+
+def tier_for(stage):
+    # MODEL_TIER_<STAGE>, e.g. MODEL_TIER_HASHNODE=balanced, moves a single stage to another tier.
+    tier = os.environ.get(f"MODEL_TIER_{stage.upper()}") or STAGE_TIERS.get(stage, DEFAULT_TIER)
+    if tier not in TIERS:
+        raise ValueError(f"Unknown model tier '{tier}' for stage '{stage}' (expected one of {', '.join(TIERS)})")
+    return tier
+
+def models_for(stage):
+    tier = tier_for(stage)
+    models = []
+    for t in [tier] + FALLBACK_TIERS[tier]:
+        if TIERS[t] not in models:
+            models.append(TIERS[t])
+    return models
+
+def cost(model_id, usage):
+    if model_id not in PRICES:
+        return 0.0
+    input_price, output_price = PRICES[model_id]
+    # input_tokens excludes the cached part of the prompt, which is billed separately.
+    input_cost = input_price * (usage.get("input_tokens", 0)
+                                + CACHE_WRITE_FACTOR * (usage.get("cache_creation_input_tokens") or 0)
+                                + CACHE_READ_FACTOR * (usage.get("cache_read_input_tokens") or 0))
+    return (input_cost + usage.get("output_tokens", 0) * output_price) / 1_000_000
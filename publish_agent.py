@@ -1,14 +1,64 @@
 import os
+import re
 import sys
-import json
-import requests
-from github import Github, Auth
-from datetime import datetime
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import http_client
+from http_client import GITHUB_API, github_headers
+from topic_index import TopicIndex
+from history_store import HistoryStore
+from issue_ops import IssueOps
+import metrics
 
-HISTORY_FILE = "topic_history.json"
+LINKEDIN_API = os.environ.get("LINKEDIN_API_URL", "https://api.linkedin.com")
+LINKEDIN_ID_PATTERN = re.compile(r"LinkedIn ID: (\S+)")
+
+def repo_url():
+    return f"{GITHUB_API}/repos/{os.environ['GITHUB_REPOSITORY']}"
+
+def issue_url(number):
+    return f"{repo_url()}/issues/{number}"
+
+def github_call(method, url, **kwargs):
+    resp = http_client.request(method, url, headers=github_headers(os.environ["GITHUB_TOKEN"]), **kwargs)
+    if resp.status_code >= 300:
+        raise Exception(f"GitHub Error: {resp.text}")
+    return resp.json()
+
+def get_issue(number):
+    return github_call("GET", issue_url(number))
+
+def issue_ops():
+    owner, repo = os.environ["GITHUB_REPOSITORY"].split("/")
+    return IssueOps(owner, repo, github_headers(os.environ["GITHUB_TOKEN"]))
+
+def posted_id(issue):
+    # A LinkedIn ID in the comments means an earlier run already posted this issue, whatever its labels say.
+    if not issue.get("comments"):
+        return None
+    comments = http_client.paginate(f"{issue_url(issue['number'])}/comments?per_page=100",
+                                    headers=github_headers(os.environ["GITHUB_TOKEN"]))
+    for comment in comments:
+        match = LINKEDIN_ID_PATTERN.search(comment.get("body") or "")
+        if match:
+            return match.group(1)
+    return None
+
+def list_publish_issues():
+    url = f"{repo_url()}/issues?labels=publish&state=open&per_page=100&direction=asc"
+    issues = []
+    for issue in http_client.paginate(url, headers=github_headers(os.environ["GITHUB_TOKEN"])):
+        post_id = posted_id(issue)
+        if post_id:
+            print(f"⏭️ Skipping #{issue['number']}: already on LinkedIn ({post_id})")
+            continue
+        issues.append(issue)
+    return issues
 
 def post_to_linkedin(content):
-    url = "https://api.linkedin.com/v2/ugcPosts"
+    url = f"{LINKEDIN_API}/v2/ugcPosts"
     headers = {
         "Authorization": f"Bearer {os.environ['LINKEDIN_ACCESS_TOKEN']}",
         "Content-Type": "application/json",
@@ -26,48 +76,120 @@ def post_to_linkedin(content):
         "visibility": {"com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"}
     }
     
-    resp = requests.post(url, headers=headers, json=payload)
+    resp = http_client.post(url, headers=headers, json=payload)
     if resp.status_code != 201:
         raise Exception(f"LinkedIn Error: {resp.text}")
     return resp.json()['id']
 
-def update_history_file(topic):
-    if os.path.exists(HISTORY_FILE):
-        with open(HISTORY_FILE, "r") as f:
-            history = json.load(f)
-    else:
-        history = []
-        
-    history.append({"date": str(datetime.now().date()), "topic": topic})
-    
-    with open(HISTORY_FILE, "w") as f:
-        json.dump(history, f, indent=2)
+def update_history_file(*topics):
+    store = HistoryStore()
+    for topic in topics:
+        store.append(topic)
+    TopicIndex.load(store.topics()).save()
+
+class LinkedInScheduler:
+    # Hands out posting slots at least `spacing` seconds apart, shared by all workers.
+    def __init__(self, spacing=0.0):
+        self.spacing = spacing
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait_turn(self):
+        with self._lock:
+            slot = max(time.time(), self._next_slot)
+            self._next_slot = slot + self.spacing
+        time.sleep(max(0.0, slot - time.time()))
+
+def parse_issue(issue):
+    raw = issue['body'] or ""
+    topic = issue['title'].replace("Draft: ", "")
+    li_content = raw.split("---LINKEDIN_POST---")[1].split("---END---")[0].strip()
+    if not li_content:
+        raise ValueError("Parsed LinkedIn content is empty!")
+    return topic, li_content
+
+def publish_issue(issue, scheduler=None, ops=None):
+    ops = ops or issue_ops()
+    node_id = issue['node_id']
+    status = {"number": issue['number'], "topic": issue['title'].replace("Draft: ", ""), "post_id": None, "error": None}
+    with ops.action(f"publish #{issue['number']}"), metrics.stage("publish", issue=issue['number']) as record:
+        try:
+            topic, li_content = parse_issue(issue)
+
+            print(f"🚀 Posting to LinkedIn: {topic}")
+            ops.transition(node_id, comments=["🚀 Pushing post to LinkedIn..."])
+            if scheduler:
+                scheduler.wait_turn()
+            status["post_id"] = post_to_linkedin(li_content)
+
+            ops.transition(node_id, comments=[f"✅ Published successfully!\nLinkedIn ID: {status['post_id']}"], close=True)
+        except Exception as e:
+            status["error"] = str(e)
+            record["outcome"] = f"error: {e.__class__.__name__}"
+            try:
+                # The label always goes, or every later batch would retry the issue. Once the post is live the issue
+                # is closed too, and the LinkedIn ID in the comment keeps it from ever being posted again.
+                if status["post_id"]:
+                    ops.transition(node_id, comments=[f"⚠️ Posted, but the follow-up failed: {e}\nLinkedIn ID: {status['post_id']}"],
+                                   remove_labels=["publish"], close=True)
+                else:
+                    ops.transition(node_id, comments=[f"❌ Failed during publish sequence: {e}"], remove_labels=["publish"])
+            except Exception as cleanup_error:
+                print(f"⚠️ Could not report failure on #{issue['number']}: {cleanup_error}")
+    return status
+
+def publish_batch(concurrency=2, spacing=0.0):
+    issues = list_publish_issues()
+    print(f"📬 Found {len(issues)} issue(s) labeled 'publish'")
+    scheduler = LinkedInScheduler(spacing)
+    ops = issue_ops()
+    history_lock = threading.Lock()
+
+    def publish(issue):
+        status = publish_issue(issue, scheduler, ops)
+        # Recorded right away, so a run cancelled mid-batch still keeps history for what reached LinkedIn.
+        if status["post_id"]:
+            with history_lock:
+                update_history_file(status["topic"])
+        return status
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        results = list(pool.map(publish, issues))
+
+    for r in results:
+        if r["error"] and r["post_id"]:
+            print(f"⚠️ #{r['number']} {r['topic']}: posted ({r['post_id']}) but {r['error']}")
+        elif r["error"]:
+            print(f"❌ #{r['number']} {r['topic']}: {r['error']}")
+        else:
+            print(f"✅ #{r['number']} {r['topic']}: {r['post_id']}")
+    return results
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Publish approved drafts to LinkedIn.")
+    parser.add_argument("--batch", action="store_true",
+                        help="Publish every open issue labeled 'publish' instead of ISSUE_NUMBER")
+    parser.add_argument("--concurrency", type=int, default=int(os.environ.get("PUBLISH_CONCURRENCY") or 2),
+                        help="Maximum issues processed at the same time")
+    parser.add_argument("--spacing", type=float, default=float(os.environ.get("LINKEDIN_POST_SPACING") or 0),
+                        help="Minimum seconds between LinkedIn posts")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    auth = Auth.Token(os.environ["GITHUB_TOKEN"])
-    g = Github(auth=auth)
-    
-    repo = g.get_repo(os.environ["GITHUB_REPOSITORY"])
-    issue = repo.get_issue(int(os.environ["ISSUE_NUMBER"]))
-    
-    raw = issue.body or ""
-    topic = issue.title.replace("Draft: ", "")
-    
-    try:
-        li_content = raw.split("---LINKEDIN_POST---")[1].split("---END---")[0].strip()
-            
-        if not li_content:
-            raise ValueError("Parsed LinkedIn content is empty!")
-            
-        print(f"🚀 Posting to LinkedIn: {topic}")
-        issue.create_comment("🚀 Pushing post to LinkedIn...")
-        post_id = post_to_linkedin(li_content)
-        
-        update_history_file(topic)
-        
-        issue.create_comment(f"✅ Published successfully!\nLinkedIn ID: {post_id}")
-        issue.edit(state='closed')
-        
-    except Exception as e:
-        issue.create_comment(f"❌ Failed during publish sequence: {e}")
-        sys.exit(1)
\ No newline at end of file
+    args = parse_args()
+    if args.batch:
+        results = publish_batch(args.concurrency, args.spacing)
+        if any(r["error"] for r in results):
+            sys.exit(1)
+        sys.exit(0)
+
+    issue = get_issue(int(os.environ["ISSUE_NUMBER"]))
+    existing = posted_id(issue)
+    if existing:
+        print(f"⏭️ #{issue['number']} is already on LinkedIn ({existing}), not posting again")
+        sys.exit(0)
+    status = publish_issue(issue)
+    if status["post_id"]:
+        update_history_file(status["topic"])
+    if status["error"]:
+        sys.exit(1)
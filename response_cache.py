@@ -0,0 +1,111 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+CACHE_DIR = os.environ.get("LLM_CACHE_DIR", ".llm_cache")
+MAX_BYTES = int(os.environ.get("LLM_CACHE_MAX_BYTES") or 50 * 1024 * 1024)
+# Short enough that tomorrow's scheduled run asks for a fresh topic, long enough to cover retries.
+MAX_AGE = int(os.environ.get("LLM_CACHE_MAX_AGE") or 12 * 3600)
+# Other processes share the directory, so the in-process size estimate is rechecked with a full walk this often.
+EVICT_EVERY = 100
+
+class ResponseCache:
+    def __init__(self, path=CACHE_DIR, max_bytes=MAX_BYTES, max_age=MAX_AGE):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._size = None  # bytes on disk as of the last evict() plus what this process wrote since
+        self._puts = 0
+        self._lock = threading.Lock()
+
+    def key(self, model_id, prompt, max_tokens, temperature):
+        prompt_hash = hashlib.sha256(json.dumps(prompt, sort_keys=True).encode()).hexdigest()
+        raw = json.dumps([model_id, prompt_hash, max_tokens, temperature])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _file(self, key):
+        return os.path.join(self.path, key[:2], f"{key}.json")
+
+    def get(self, key):
+        path = self._file(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            entry = None
+
+        if entry and time.time() - entry["created"] <= self.max_age:
+            try:
+                os.utime(path)  # mtime doubles as the LRU clock
+            except OSError:
+                pass  # evicted by another writer since the read; the entry is still good for this call
+            with self._lock:
+                self.hits += 1
+            return entry
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, text, model_id=None, stop_reason=None):
+        path = self._file(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        data = json.dumps({"created": time.time(), "model_id": model_id, "text": text, "stop_reason": stop_reason}).encode()
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        # Walking the whole directory on every write is what made puts slow; only do it once the limit may be hit.
+        with self._lock:
+            self._puts += 1
+            if self._size is not None:
+                self._size += len(data)
+            due = self._size is None or self._size > self.max_bytes or self._puts % EVICT_EVERY == 0
+        if due:
+            self.evict()
+
+    def evict(self):
+        entries = []
+        now = time.time()
+        for root, _, files in os.walk(self.path):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                if now - st.st_mtime > self.max_age:
+                    self._remove(path)
+                else:
+                    entries.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+        with self._lock:
+            self._size = total
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+response_cache = ResponseCache()
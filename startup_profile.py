@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+import builtins
+import threading
+from contextlib import contextmanager
+
+# Import this module first; with PROFILE_STARTUP=1 it times every top-level import and named init step after it.
+ENABLED = os.environ.get("PROFILE_STARTUP", "").lower() in ("1", "true", "yes")
+MIN_SECONDS = 0.001
+
+_start = time.perf_counter()
+_timings = []
+_local = threading.local()
+_original_import = builtins.__import__
+_reported = False
+
+def _timed_import(name, *args, **kwargs):
+    # Only the outermost import is recorded, so a module's time includes everything it pulls in.
+    if getattr(_local, "depth", 0) or name in sys.modules:
+        return _original_import(name, *args, **kwargs)
+    _local.depth = 1
+    start = time.perf_counter()
+    try:
+        return _original_import(name, *args, **kwargs)
+    finally:
+        _local.depth = 0
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_SECONDS:
+            _timings.append((f"import {name}", elapsed))
+
+@contextmanager
+def step(label):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if ENABLED:
+            _timings.append((label, time.perf_counter() - start))
+
+def report(label="startup"):
+    # Printed once per process: for Streamlit that is the first render, later reruns are warm.
+    global _reported
+    if not ENABLED or _reported:
+        return
+    _reported = True
+    total = time.perf_counter() - _start
+    print(f"⏱️ {label}: {total * 1000:.0f} ms")
+    for name, seconds in sorted(_timings, key=lambda t: -t[1]):
+        print(f"   {seconds * 1000:8.1f} ms  {name}")
+
+if ENABLED:
+    builtins.__import__ = _timed_import
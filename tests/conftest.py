@@ -0,0 +1,29 @@
+import os
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+import fake_services
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    # The agents read and write their files relative to the working directory.
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GITHUB_REPOSITORY", "test/repo")
+    monkeypatch.setenv("GITHUB_TOKEN", "test")
+    monkeypatch.setenv("LLM_CACHE_BYPASS", "1")
+    return tmp_path
+
+@pytest.fixture
+def github(monkeypatch):
+    import issue_ops
+    import publish_agent
+    server = fake_services.start(fake_services.GitHubHandler)
+    monkeypatch.setattr(publish_agent, "GITHUB_API", server.url)
+    monkeypatch.setattr(issue_ops, "GITHUB_API", server.url)
+    monkeypatch.setattr(issue_ops, "GRAPHQL_URL", f"{server.url}/graphql")
+    yield server
+    server.shutdown()
@@ -0,0 +1,23 @@
+import model_router
+from llm import build_payload
+from fake_services import FakeBedrock
+
+def usage(bedrock, model_id, system_words):
+    payload = build_payload("Write about caching", 100, 0.7, system=" ".join(["rule"] * system_words))
+    return bedrock.cache_usage(model_id, payload)
+
+def test_prefix_below_model_minimum_is_not_cached():
+    bedrock = FakeBedrock()
+    for _ in range(2):
+        assert usage(bedrock, model_router.BALANCED_MODEL, 1000) == {"input_tokens": 1003}
+        assert usage(bedrock, model_router.FAST_MODEL, 2000) == {"input_tokens": 2003}
+        assert usage(bedrock, model_router.STRONG_MODEL, 2000) == {"input_tokens": 2003}
+
+def test_prefix_over_minimum_is_written_then_read_per_model():
+    bedrock = FakeBedrock()
+    assert usage(bedrock, model_router.BALANCED_MODEL, 2000) == \
+        {"input_tokens": 3, "cache_read_input_tokens": 0, "cache_creation_input_tokens": 2000}
+    assert usage(bedrock, model_router.BALANCED_MODEL, 2000) == \
+        {"input_tokens": 3, "cache_read_input_tokens": 2000, "cache_creation_input_tokens": 0}
+    assert usage(bedrock, model_router.STRONG_MODEL, 5000) == \
+        {"input_tokens": 3, "cache_read_input_tokens": 0, "cache_creation_input_tokens": 5000}
@@ -0,0 +1,48 @@
+import json
+from history_store import HistoryStore
+
+def lines(*entries):
+    return "".join(json.dumps({"date": d, "topic": t}) + "\n" for d, t in entries).encode()
+
+def test_query_filters_by_date_and_pages_newest_first():
+    store = HistoryStore(path=None)
+    store.feed(lines(("2024-01-03", "c"), ("2024-01-01", "a"), ("2024-01-02", "b"), ("2024-01-02", "b2"), ("2024-01-05", "e")))
+
+    rows, total = store.query("2024-01-02", "2024-01-03", per_page=2)
+    assert total == 3
+    assert [r["topic"] for r in rows] == ["c", "b2"]
+    rows, _ = store.query("2024-01-02", "2024-01-03", page=2, per_page=2)
+    assert [r["topic"] for r in rows] == ["b"]
+    rows, total = store.query(newest_first=False, per_page=10)
+    assert total == 5
+    assert [r["topic"] for r in rows] == ["a", "b", "b2", "c", "e"]
+
+def test_feed_parses_only_the_new_tail():
+    store = HistoryStore(path=None)
+    data = lines(("2024-01-01", "a"))
+    assert [e["topic"] for e in store.feed(data)] == ["a"]
+    assert store.feed(data) == []
+    assert [e["topic"] for e in store.feed(data + lines(("2024-01-02", "b")))] == ["b"]
+    assert store.topics() == ["a", "b"]
+
+def test_feed_rebuilds_when_the_seen_prefix_changed():
+    store = HistoryStore(path=None)
+    store.feed(lines(("2024-01-01", "old"), ("2024-01-02", "b")))
+    rewritten = lines(("2024-01-01", "New"), ("2024-01-02", "b"), ("2024-01-03", "c"))
+    assert [e["topic"] for e in store.feed(rewritten)] == ["New", "b", "c"]
+    assert store.topics() == ["New", "b", "c"]
+    assert not store.has_topic("old") and store.has_topic("  new ")
+
+def test_half_written_line_waits_for_the_next_read():
+    store = HistoryStore(path=None)
+    data = lines(("2024-01-01", "a"))
+    assert [e["topic"] for e in store.feed(data + b'{"date": "2024-01-02", "to')] == ["a"]
+    assert [e["topic"] for e in store.feed(data + lines(("2024-01-02", "b")))] == ["b"]
+
+def test_refresh_picks_up_appends_from_other_writers():
+    store = HistoryStore()
+    store.append("Mine", "2024-01-01")
+    with open("topic_history.jsonl", "ab") as f:
+        f.write(lines(("2024-01-02", "Theirs")))
+    assert [e["topic"] for e in store.refresh()] == ["Theirs"]
+    assert HistoryStore().topics() == ["Mine", "Theirs"]
@@ -0,0 +1,33 @@
+import threading
+import fake_services
+from issue_ops import IssueOps
+
+def test_action_reports_to_its_caller_only(github):
+    ops = IssueOps("test", "repo", {})
+    reports = {}
+
+    def session(name, calls):
+        with ops.action(name) as report:
+            for _ in range(calls):
+                ops.list_issues(["draft"])
+        reports[name] = report
+
+    threads = [threading.Thread(target=session, args=(name, n)) for name, n in [("one", 1), ("three", 3)]]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert reports["one"]["round_trips"] == 1
+    assert reports["three"]["round_trips"] == 3
+    assert not hasattr(ops, "last_report")
+
+def test_missing_label_is_created_before_it_is_added(github):
+    issue = fake_services.add_issue(github.state, "Draft: Topic", "body", ["draft"])
+    ops = IssueOps("test", "repo", {})
+    ops.transition(issue["node_id"], add_labels=["publish"])
+    assert "publish" in github.state["labels"]
+    assert [l["name"] for l in issue["labels"]] == ["draft", "publish"]
+
+    other = IssueOps("test", "repo", {})  # another session, after the label exists
+    other.transition(issue["node_id"], remove_labels=["publish", "never-created"])
+    assert [l["name"] for l in issue["labels"]] == ["draft"]
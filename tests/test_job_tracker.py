@@ -0,0 +1,33 @@
+import job_tracker
+
+class FakeCache:
+    def __init__(self, job, status):
+        self.job = job
+        self.status = status
+
+    def get(self, url, max_age=None):
+        if "/issues?" in url:
+            return 200, [{"html_url": "https://example/issues/1", "body": job_tracker.correlation_marker(self.job["id"])}]
+        run = {"id": 7, "html_url": "https://example/runs/7", "status": self.status, "conclusion": "success",
+               "display_title": f"Draft {self.job['id']}"}
+        return 200, {"workflow_runs": [run]} if "/runs?" in url else run
+
+def test_finished_job_keeps_its_duration(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(job_tracker.time, "time", lambda: now[0])
+    job = job_tracker.new_job("Topic")
+    job["status"] = "queued"
+
+    now[0] = 1020.0
+    job_tracker.poll("repo", FakeCache(job, "in_progress"), job)
+    assert job["status"] == "in_progress" and job["finished"] is None
+    assert job_tracker.elapsed(job) == 20
+
+    now[0] = 1090.0
+    job["next_poll"] = now[0]
+    job_tracker.poll("repo", FakeCache(job, "completed"), job)
+    assert job["status"] == "completed"
+    assert job["issue_url"] == "https://example/issues/1"
+
+    now[0] = 5000.0
+    assert job_tracker.elapsed(job) == 90
@@ -0,0 +1,76 @@
+import pytest
+from botocore.exceptions import ClientError
+import fake_services
+import llm
+import model_router
+from response_cache import ResponseCache
+
+class ThrottledFastTier(fake_services.FakeBedrock):
+    def respond(self, model_id, body):
+        self.attempts = getattr(self, "attempts", 0) + 1
+        if model_id == model_router.TIERS["fast"]:
+            raise ClientError({"Error": {"Code": "ThrottlingException", "Message": "slow down"}}, "InvokeModel")
+        return super().respond(model_id, body)
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.delenv("LLM_CACHE_BYPASS", raising=False)
+    return ResponseCache(str(tmp_path / "cache"))
+
+def test_fallback_response_is_served_from_cache(cache):
+    client = ThrottledFastTier()
+    first = llm.invoke_claude_full("Return ONLY the topic title", stage="topic", client=client, cache=cache)
+    assert first["model_id"] == model_router.TIERS["balanced"]
+    assert client.attempts == 2
+
+    again = llm.invoke_claude_full("Return ONLY the topic title", stage="topic", client=client, cache=cache)
+    assert client.attempts == 2
+    assert again["text"] == first["text"]
+    assert again["model_id"] == model_router.TIERS["balanced"]
+
+def test_streamed_fallback_response_is_served_from_cache(cache):
+    client = ThrottledFastTier()
+    meta = {}
+    text = "".join(llm.stream_claude("Return ONLY the topic title", stage="topic", client=client, cache=cache, meta=meta))
+    assert meta["model_id"] == model_router.TIERS["balanced"]
+
+    meta = {}
+    assert "".join(llm.stream_claude("Return ONLY the topic title", stage="topic", client=client, cache=cache, meta=meta)) == text
+    assert client.attempts == 2
+    assert meta["model_id"] == model_router.TIERS["balanced"]
+
+def test_non_retryable_error_does_not_fall_back(cache):
+    class Invalid(fake_services.FakeBedrock):
+        def respond(self, model_id, body):
+            raise ClientError({"Error": {"Code": "ValidationException", "Message": "bad"}}, "InvokeModel")
+
+    with pytest.raises(ClientError):
+        llm.invoke_claude_full("Return ONLY the topic title", stage="topic", client=Invalid(), cache=cache)
+
+def article(words):
+    return " ".join(["#", "Title"] + [f"word{i}" for i in range(words - 2)])
+
+def test_continued_generation_resumes_from_each_chunk():
+    client = fake_services.FakeBedrock(article_tokens=220)
+    text, complete = llm.invoke_claude_continued("Write a Hashnode article", chunk_tokens=100, total_budget=1000,
+                                                 client=client, model_id="m")
+    assert complete
+    assert text == article(220)
+    assert [c["usage"]["output_tokens"] for c in client.calls] == [100, 100, 20]
+    assert [c["stop_reason"] for c in client.calls] == ["max_tokens", "max_tokens", "end_turn"]
+
+def test_continued_generation_stops_at_the_total_budget():
+    client = fake_services.FakeBedrock(article_tokens=500)
+    text, complete = llm.invoke_claude_continued("Write a Hashnode article", chunk_tokens=100, total_budget=250,
+                                                 client=client, model_id="m")
+    assert not complete
+    assert text == article(250)
+    assert [c["usage"]["output_tokens"] for c in client.calls] == [100, 100, 50]
+
+def test_continuation_marks_the_last_prefill_block_for_caching():
+    payload = llm.build_payload("prompt", 100, 0.7, prefill=["first chunk", " second chunk"], system="rules")
+    assistant = payload["messages"][1]
+    assert assistant["role"] == "assistant"
+    assert [b["text"] for b in assistant["content"]] == ["first chunk", " second chunk"]
+    assert ["cache_control" in b for b in assistant["content"]] == [False, True]
+    assert llm.cache_input(payload)[0] == payload["system"]
@@ -0,0 +1,26 @@
+import pytest
+import model_router
+
+def test_stages_use_their_tier_then_fall_back():
+    assert model_router.models_for("topic") == [model_router.FAST_MODEL, model_router.BALANCED_MODEL]
+    assert model_router.models_for("linkedin") == [model_router.BALANCED_MODEL, model_router.STRONG_MODEL]
+    assert model_router.models_for("hashnode") == [model_router.STRONG_MODEL, model_router.BALANCED_MODEL]
+    assert model_router.models_for("unknown") == [model_router.STRONG_MODEL, model_router.BALANCED_MODEL]
+
+def test_stage_tier_override(monkeypatch):
+    monkeypatch.setenv("MODEL_TIER_HASHNODE", "balanced")
+    assert model_router.models_for("hashnode") == [model_router.BALANCED_MODEL, model_router.STRONG_MODEL]
+    monkeypatch.setenv("MODEL_TIER_HASHNODE", "huge")
+    with pytest.raises(ValueError):
+        model_router.models_for("hashnode")
+
+def test_fallback_to_the_same_model_is_dropped(monkeypatch):
+    monkeypatch.setitem(model_router.TIERS, "balanced", model_router.FAST_MODEL)
+    assert model_router.models_for("topic") == [model_router.FAST_MODEL]
+
+def test_cost_bills_cache_reads_and_writes_separately():
+    usage = {"input_tokens": 1_000_000, "output_tokens": 1_000_000,
+             "cache_creation_input_tokens": 1_000_000, "cache_read_input_tokens": 1_000_000}
+    assert model_router.cost(model_router.BALANCED_MODEL, usage) == pytest.approx(3.0 + 3.75 + 0.3 + 15.0)
+    assert model_router.cost(model_router.FAST_MODEL, {"input_tokens": 2_000_000}) == pytest.approx(2.0)
+    assert model_router.cost("some-other-model", usage) == 0.0
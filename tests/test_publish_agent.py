@@ -0,0 +1,78 @@
+import pytest
+import fake_services
+import publish_agent
+from history_store import HistoryStore
+from issue_ops import IssueOps
+
+BODY = "🤖 Draft generated for topic: {0}\n\n---HASHNODE_ARTICLE---\n# {0}\n---LINKEDIN_POST---\nPost about {0}\n---END---\n"
+
+class Cancelled(BaseException):
+    pass
+
+class FlakyOps(IssueOps):
+    # Records every transition and fails the "published" one, as if GitHub went away right after the LinkedIn post.
+    def __init__(self):
+        super().__init__("test", "repo", {})
+        self.calls = []
+
+    def transition(self, node_id, **changes):
+        self.calls.append(changes)
+        if changes.get("close") and "✅" in changes["comments"][0]:
+            raise Exception("GitHub is down")
+
+def add_publish_issue(github, topic):
+    return fake_services.add_issue(github.state, f"Draft: {topic}", BODY.format(topic), ["draft", "publish"])
+
+def test_failed_follow_up_after_post_unlabels_and_closes(monkeypatch):
+    monkeypatch.setattr(publish_agent, "post_to_linkedin", lambda content: "urn:li:share:7")
+    ops = FlakyOps()
+    issue = {"number": 1, "node_id": "I_1", "title": "Draft: Topic", "body": BODY.format("Topic")}
+
+    status = publish_agent.publish_issue(issue, ops=ops)
+
+    assert status["post_id"] == "urn:li:share:7"
+    assert status["error"] == "GitHub is down"
+    recovery = ops.calls[-1]
+    assert recovery["remove_labels"] == ["publish"]
+    assert recovery["close"] is True
+    assert "LinkedIn ID: urn:li:share:7" in recovery["comments"][0]
+
+def test_failure_before_post_only_unlabels(monkeypatch):
+    def fail(content):
+        raise Exception("LinkedIn Error: 500")
+    monkeypatch.setattr(publish_agent, "post_to_linkedin", fail)
+    ops = FlakyOps()
+    issue = {"number": 1, "node_id": "I_1", "title": "Draft: Topic", "body": BODY.format("Topic")}
+
+    status = publish_agent.publish_issue(issue, ops=ops)
+
+    assert status["post_id"] is None
+    assert ops.calls[-1]["remove_labels"] == ["publish"]
+    assert not ops.calls[-1].get("close")
+
+def test_list_publish_issues_skips_issues_already_posted(github):
+    posted = add_publish_issue(github, "Posted before")
+    fresh = add_publish_issue(github, "Not posted yet")
+    with github.state["lock"]:
+        fake_services.add_comment(github.state, posted, "⚠️ Posted, but the follow-up failed: boom\nLinkedIn ID: urn:li:share:1")
+
+    issues = publish_agent.list_publish_issues()
+
+    assert [i["number"] for i in issues] == [fresh["number"]]
+
+def test_batch_records_history_as_each_post_lands(github, monkeypatch):
+    add_publish_issue(github, "First topic")
+    add_publish_issue(github, "Second topic")
+    posts = iter(["urn:li:share:1"])
+
+    def post(content):
+        post_id = next(posts, None)
+        if post_id is None:
+            raise Cancelled()
+        return post_id
+    monkeypatch.setattr(publish_agent, "post_to_linkedin", post)
+
+    with pytest.raises(Cancelled):
+        publish_agent.publish_batch(concurrency=1)
+
+    assert HistoryStore().topics() == ["First topic"]
@@ -0,0 +1,45 @@
+import os
+import time
+import response_cache
+from response_cache import ResponseCache
+
+def entry_files(cache):
+    return sorted(name for _, _, files in os.walk(cache.path) for name in files if name.endswith(".json"))
+
+def test_evicts_least_recently_used_over_the_size_limit(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_bytes=400)
+    keys = [cache.key("m", f"prompt {i}", 100, 0.7) for i in range(3)]
+    for i, key in enumerate(keys[:2]):
+        cache.put(key, "x" * 100)
+        os.utime(cache._file(key), (time.time() - 100 + i, time.time() - 100 + i))
+    assert cache.get(keys[0])  # touching the older entry makes the second one least recently used
+    cache.put(keys[2], "x" * 100)
+    assert entry_files(cache) == sorted(f"{k}.json" for k in [keys[0], keys[2]])
+
+def test_expired_entry_is_a_miss(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_age=60)
+    key = cache.key("m", "prompt", 100, 0.7)
+    cache.put(key, "text", "m", "end_turn")
+    assert cache.get(key)["text"] == "text"
+    cache.max_age = -1
+    assert cache.get(key) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+def test_put_only_walks_the_directory_when_the_limit_may_be_hit(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path), max_bytes=10 ** 6)
+    walks = []
+    evict = cache.evict
+    monkeypatch.setattr(cache, "evict", lambda: walks.append(1) or evict())
+    for i in range(response_cache.EVICT_EVERY):
+        cache.put(cache.key("m", f"prompt {i}", 100, 0.7), "text")
+    assert len(walks) == 2  # the first put, to learn the size on disk, then the periodic recheck
+
+def test_entry_evicted_between_read_and_touch_is_still_returned(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path))
+    key = cache.key("m", "prompt", 100, 0.7)
+    cache.put(key, "text")
+
+    def gone(path):
+        raise FileNotFoundError(path)
+    monkeypatch.setattr(response_cache.os, "utime", gone)
+    assert cache.get(key)["text"] == "text"
@@ -0,0 +1,55 @@
+import pytest
+import draft_agent
+from topic_pool import TopicPool, parse_topics
+
+def test_replay_applies_adds_and_pops_in_order():
+    pool = TopicPool(path=None)
+    pool.push("Kafka idempotent consumers")
+    assert not pool.push("kafka  Idempotent consumers")  # same topic once normalised
+    pool.push("Read replicas and lag")
+    pool.consume(pool.pop())
+
+    replayed = TopicPool(path=None, data="".join(pool.pending).encode())
+    assert replayed.topics() == ["Read replicas and lag"]
+
+def test_pop_without_consume_leaves_topic_queued():
+    pool = TopicPool()
+    pool.push("Outbox pattern")
+    assert pool.pop() == "Outbox pattern"
+    assert TopicPool().topics() == ["Outbox pattern"]
+    pool.consume("Outbox pattern")
+    assert TopicPool().topics() == []
+
+def test_parse_topics_strips_list_markup():
+    assert parse_topics('1. **Idempotent consumers** in Kafka\n2) "Quoted"\n\n- bullet one\n') == \
+        ["Idempotent consumers in Kafka", "Quoted", "bullet one"]
+
+def test_failed_draft_keeps_queued_topic(monkeypatch):
+    monkeypatch.setattr(draft_agent, "generate_linkedin_post", lambda topic: "post")
+    monkeypatch.setattr(draft_agent, "generate_hashnode_article", lambda topic: ("article", True))
+    monkeypatch.setattr(draft_agent, "send_notification_email", lambda *args: None)
+    TopicPool().push("Queued by hand", source="brainstorm")
+
+    def fail(*args):
+        raise Exception("GitHub Error: 502")
+    pool = TopicPool()
+    [topic] = draft_agent.pick_topics([], 1, pool)
+    monkeypatch.setattr(draft_agent, "create_review_issue", fail)
+    with pytest.raises(Exception):
+        draft_agent.draft_topic(topic, pool)
+    assert TopicPool().topics() == ["Queued by hand"]
+
+    monkeypatch.setattr(draft_agent, "create_review_issue", lambda *args: {"html_url": "https://example/1"})
+    draft_agent.draft_topic(topic, pool)
+    assert TopicPool().topics() == []
+
+def test_picking_from_a_low_pool_does_not_wait_on_a_refill(monkeypatch):
+    refills = []
+    monkeypatch.setattr(draft_agent, "refill", lambda pool, known: refills.append(list(known)) or 0)
+    pool = TopicPool()
+    pool.push("Only queued topic")
+    assert draft_agent.pick_topics([], 1, pool) == ["Only queued topic"]
+    assert refills == []
+
+    draft_agent.top_up_pool(pool, ["Only queued topic"])
+    assert refills == [["Only queued topic"]]
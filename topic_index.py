@@ -0,0 +1,77 @@
+import os
+import re
+import zlib
+import numpy as np
+
+INDEX_FILE = "topic_index.npz"
+NUM_PERM = 128
+SIMILARITY_THRESHOLD = 0.3
+
+STOP_WORDS = {
+    "a", "an", "and", "as", "at", "by", "for", "from", "how", "in", "into", "is", "of", "on",
+    "or", "the", "to", "vs", "when", "with", "without", "your", "using", "implementing"
+}
+
+_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_rng = np.random.RandomState(511)
+_A = _rng.randint(1, 1 << 31, size=NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, 1 << 31, size=NUM_PERM).astype(np.uint64)
+
+def digest(topics):
+    return zlib.crc32("\n".join(topics).encode())
+
+def shingles(text):
+    # Titles are short, so plain words (crudely de-pluralised) beat n-grams for catching rewordings.
+    words = [w for w in re.findall(r"[a-z0-9]+", text.lower()) if w not in STOP_WORDS]
+    return {w[:-1] if w.endswith("s") and len(w) > 3 else w for w in words}
+
+def signature(text):
+    tokens = shingles(text)
+    if not tokens:
+        return np.full(NUM_PERM, _MAX_HASH, dtype=np.uint32)
+    hashes = np.array([zlib.crc32(t.encode()) for t in tokens], dtype=np.uint64)
+    permuted = ((hashes[:, None] * _A + _B) % _PRIME) & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+class TopicIndex:
+    def __init__(self, topics=(), signatures=None):
+        self.topics = list(topics)
+        self.signatures = signatures if signatures is not None else np.empty((0, NUM_PERM), dtype=np.uint32)
+        self._sync()
+
+    def _sync(self):
+        # Only topics appended since the signatures were built need hashing.
+        missing = self.topics[len(self.signatures):]
+        if missing:
+            self.signatures = np.vstack([self.signatures] + [signature(t)[None, :] for t in missing])
+
+    @classmethod
+    def load(cls, topics, path=INDEX_FILE):
+        signatures = None
+        if os.path.exists(path):
+            data = np.load(path)
+            stored = data["signatures"]
+            # A rewritten or wiped history invalidates the stored signatures.
+            if (stored.shape[1] == NUM_PERM and len(stored) <= len(topics)
+                    and int(data["digest"]) == digest(topics[:len(stored)])):
+                signatures = stored
+        return cls(topics, signatures)
+
+    def save(self, path=INDEX_FILE):
+        with open(path, "wb") as f:
+            np.savez_compressed(f, signatures=self.signatures, digest=np.uint32(digest(self.topics)))
+
+    def add(self, topic):
+        self.topics.append(topic)
+        self._sync()
+
+    def similarities(self, text):
+        if not self.topics:
+            return np.empty(0)
+        return (self.signatures == signature(text)).mean(axis=1)
+
+    def nearest(self, text, k=5):
+        scores = self.similarities(text)
+        order = np.argsort(-scores)[:k]
+        return [(self.topics[i], float(scores[i])) for i in order]
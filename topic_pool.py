@@ -0,0 +1,122 @@
+import os
+import re
+import json
+import threading
+from datetime import datetime
+from history_store import normalize_topic
+from llm import invoke_claude
+
+POOL_FILE = "topic_pool.jsonl"
+MIN_SIZE = int(os.environ.get("TOPIC_POOL_MIN") or 3)
+REFILL_COUNT = int(os.environ.get("TOPIC_POOL_REFILL") or 10)
+RECENT_TOPICS = 20
+
+def parse_topics(text):
+    # One topic per line; list numbering, bullets, bold markers and quotes are stripped.
+    topics = []
+    for line in text.splitlines():
+        topic = re.sub(r"^\s*(?:\d+[.)]|[-*•])\s*", "", line).replace("**", "").strip().strip('"').strip()
+        if topic:
+            topics.append(topic)
+    return topics
+
+class TopicPool:
+    # A queue of topics kept as an append-only log of "add" and "pop" events, so concurrent
+    # writers (the drafter and the Command Center) merge like the history file does.
+    def __init__(self, path=POOL_FILE, data=None):
+        self.path = path
+        self.queue = []
+        self.pending = []  # lines not yet written anywhere, for callers with path=None
+        self.reserved = set()
+        self._lock = threading.Lock()
+        if data is None and path and os.path.exists(path):
+            with open(path, "rb") as f:
+                data = f.read()
+        for line in (data or b"").splitlines():
+            if line.strip():
+                self._apply(json.loads(line))
+
+    def _apply(self, event):
+        key = normalize_topic(event["topic"])
+        if event["op"] == "add":
+            if all(normalize_topic(e["topic"]) != key for e in self.queue):
+                self.queue.append({"topic": event["topic"], "source": event.get("source"), "date": event.get("date")})
+        else:
+            self.queue = [e for e in self.queue if normalize_topic(e["topic"]) != key]
+
+    def _log(self, op, topic, **fields):
+        event = {"op": op, "topic": topic, "date": str(datetime.now().date()), **fields}
+        line = json.dumps(event) + "\n"
+        with self._lock:
+            if self.path:
+                with open(self.path, "a") as f:
+                    f.write(line)
+            else:
+                self.pending.append(line)
+            self._apply(event)
+
+    def push(self, topic, source="llm"):
+        key = normalize_topic(topic)
+        if not key or any(normalize_topic(e["topic"]) == key for e in self.queue):
+            return False
+        self._log("add", topic, source=source)
+        return True
+
+    def pop(self):
+        # Only reserves the topic for this run; the file keeps it queued until consume() confirms it was drafted,
+        # so a failed draft leaves it for the next run.
+        with self._lock:
+            if not self.queue:
+                return None
+            topic = self.queue.pop(0)["topic"]
+            self.reserved.add(normalize_topic(topic))
+        return topic
+
+    def consume(self, topic):
+        key = normalize_topic(topic)
+        if key in self.reserved:
+            self.reserved.discard(key)
+            self._log("pop", topic)
+
+    def topics(self):
+        return [e["topic"] for e in self.queue]
+
+    def __len__(self):
+        return len(self.queue)
+
+def refill_prompt(past_topics, count):
+    return f"""
+    You are an Expert Developer Advocate and Senior Staff Engineer.
+    Your task is to suggest {count} distinct, highly specific technical topics for LinkedIn posts.
+
+    Focus Areas (Mix both):
+    - Backend Engineering & System Design (e.g., Database Sharding trade-offs, Event-driven architectures, Caching strategies, Clean Architecture etc.)
+    - Generative AI & Cloud (e.g., RAG optimization, Building AI Agents with AWS Bedrock, LLM context limits, MCP Servers, etc)
+
+    Strict Constraints:
+    1. Each topic MUST be niche, actionable, and tailored for early-to-senior software engineers.
+    2. NO generic advice like "How to learn Python" or "Why AI is the future".
+    3. No two topics may cover the same idea.
+    4. DO NOT use any of these past or queued topics: {past_topics}
+
+    Output Requirement:
+    Return exactly {count} topic titles, one per line. Do not include numbering, quotes, preambles, or explanations.
+    """
+
+def refill(pool, known_topics, count=REFILL_COUNT):
+    # One call for a batch of candidates; anything too close to history, the queue or another candidate is dropped.
+    from topic_index import TopicIndex, SIMILARITY_THRESHOLD  # numpy stays out of the Command Center's startup
+    index = TopicIndex.load(list(known_topics) + pool.topics())
+    avoid = list(known_topics)[-RECENT_TOPICS:] + pool.topics()
+    candidates = parse_topics(invoke_claude(refill_prompt(avoid, count), max_tokens=60 * count, stage="topic"))
+    added = 0
+    for topic in candidates:
+        nearest = index.nearest(topic, k=1)
+        if nearest and nearest[0][1] >= SIMILARITY_THRESHOLD:
+            print(f"♻️ Dropped '{topic}' ({nearest[0][1]:.2f} similar to '{nearest[0][0]}')")
+            continue
+        if pool.push(topic, "llm"):
+            index.add(topic)
+            added += 1
+    print(f"📥 Added {added} of {len(candidates)} candidate topic(s) to the pool ({len(pool)} queued)")
+    return added